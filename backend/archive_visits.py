@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Visit Archive Script
+Moves raw visits older than the retention window into compressed
+per-month archive files (gzip NDJSON under VISIT_ARCHIVE_DIR) and deletes
+them from the visits table in bounded batches. Daily rollups are kept.
+
+Usage:
+    python archive_visits.py                     # archive visits older than VISIT_RETENTION_DAYS
+    python archive_visits.py --days 90 --vacuum  # custom window, then VACUUM the SQLite file
+    python archive_visits.py --list              # list archived months
+    python archive_visits.py --report 2024-01    # summary report for an archived month
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from database import SessionLocal, engine
+from services.visit_archive import (
+    VISIT_RETENTION_DAYS, archive_visits, list_archived_months, summarize_archived_month
+)
+
+def run_archive(days: int, batch_size: int, vacuum: bool):
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = archive_visits(db, retention_days=days, batch_size=batch_size)
+        print(f"✓ Archived {result['archived']} visits older than {result['cutoff']} "
+              f"in {time.perf_counter() - started:.1f}s")
+        for month, count in result["months"].items():
+            print(f"  - {month}: {count}")
+        print(f"✓ Pruned {result['pruned_visitor_days']} per-day visitor entries")
+    except Exception as e:
+        print(f"❌ Archive failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if vacuum and engine.dialect.name == "sqlite":
+        with engine.connect() as connection:
+            connection.execute(text("VACUUM"))
+        print("✓ VACUUM completed")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old visits into per-month files")
+    parser.add_argument("--days", type=int, default=VISIT_RETENTION_DAYS, help="keep this many days in the visits table")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the SQLite database afterwards")
+    parser.add_argument("--list", action="store_true", help="list archived months")
+    parser.add_argument("--report", metavar="YYYY-MM", help="print a report for an archived month")
+    args = parser.parse_args()
+
+    if args.list:
+        for month in list_archived_months():
+            print(month)
+    elif args.report:
+        report = summarize_archived_month(args.report)
+        if report is None:
+            print(f"No archive for {args.report}")
+            exit(1)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        run_archive(args.days, args.batch_size, args.vacuum)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Visit Rollup Backfill Script
+Creates the daily visit rollup and unique-visitor sketch tables if needed
+and rebuilds them from the visit archive and the raw visits table.
+
+Can run while the API is serving traffic: every rebuild transaction holds
+the rollup lock file (VISIT_ROLLUP_LOCK_FILE) that the API's ingest flush
+also takes, so the two never write rollups at the same time. Visits keep
+buffering in the API meanwhile, and those written after the rebuild starts
+are rolled up by its ingest queue. Both processes must see the same lock
+file (same host or container).
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import SessionLocal, Base, engine
+from models.visit import VisitDailyCountry, VisitDailyPage, VisitDailyVisitor, VisitHourly, VisitSketch
+from services.visit_rollups import rebuild_visit_rollups
+
+def backfill_visit_rollups():
+    Base.metadata.create_all(bind=engine, tables=[
+        VisitDailyCountry.__table__,
+        VisitDailyPage.__table__,
+        VisitDailyVisitor.__table__,
+        VisitHourly.__table__,
+        VisitSketch.__table__,
+    ])
+    print("✓ Rollup tables ready")
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        processed = rebuild_visit_rollups(db)
+        print(f"✓ Rolled up {processed} visits in {time.perf_counter() - started:.1f}s")
+    except Exception as e:
+        print(f"❌ Backfill failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Backfilling visit rollups...")
+    backfill_visit_rollups()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+GeoIP Benchmark Script
+Compares lookups per second of the offline range table (binary search)
+against a linear range scan and, optionally, the remote ip-api.com lookup.
+
+Usage:
+    python benchmark_geolocation.py                  # synthetic table
+    python benchmark_geolocation.py --db data/geoip.bin
+    python benchmark_geolocation.py --http 20        # also time 20 remote lookups
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import random
+import socket
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.geoip import IPRangeTable
+from utils.geolocation import lookup_country_remote
+
+def synthetic_table(range_count: int) -> IPRangeTable:
+    """Build a table of evenly spread IPv4 ranges with random countries"""
+    codes = ["KR", "US", "JP", "CN", "DE", "GB", "FR", "VN", "SG", "AU"]
+    step = (2 ** 32) // range_count
+    rows = (
+        (str(i * step), str(i * step + step - 1), random.choice(codes), None)
+        for i in range(range_count)
+    )
+    return IPRangeTable.from_rows(rows)
+
+def random_ips(count: int):
+    return [socket.inet_ntoa(random.getrandbits(32).to_bytes(4, "big")) for _ in range(count)]
+
+def bench(label: str, func, ips):
+    started = time.perf_counter()
+    for ip in ips:
+        func(ip)
+    elapsed = time.perf_counter() - started
+    rate = len(ips) / elapsed
+    print(f"{label:<28} {len(ips):>8} lookups  {elapsed * 1000:>10.1f} ms  {rate:>14,.0f} lookups/s  "
+          f"{elapsed / len(ips) * 1e6:>8.2f} µs/lookup")
+    return rate
+
+def linear_lookup(table: IPRangeTable):
+    ranges = list(zip(table.v4_starts, table.v4_ends, table.v4_country))
+
+    def lookup(ip):
+        number = int.from_bytes(socket.inet_aton(ip), "big")
+        for start, end, country in ranges:
+            if start <= number <= end:
+                return table.countries[country]
+        return None
+    return lookup
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline vs remote IP geolocation")
+    parser.add_argument("--db", help="binary table built by load_geoip.py (default: synthetic)")
+    parser.add_argument("--ranges", type=int, default=300000, help="synthetic table size")
+    parser.add_argument("--lookups", type=int, default=200000, help="number of offline lookups")
+    parser.add_argument("--http", type=int, default=0, help="number of remote ip-api.com lookups")
+    args = parser.parse_args()
+
+    if args.db:
+        table = IPRangeTable.load(args.db)
+        print(f"Loaded {len(table)} ranges from {args.db}")
+    else:
+        table = synthetic_table(args.ranges)
+        print(f"Built synthetic table with {len(table)} IPv4 ranges")
+
+    ips = random_ips(args.lookups)
+    offline_rate = bench("offline (binary search)", table.lookup, ips)
+    bench("linear scan", linear_lookup(table), ips[:max(1, args.lookups // 1000)])
+
+    if args.http:
+        async def remote():
+            started = time.perf_counter()
+            for ip in ips[:args.http]:
+                await lookup_country_remote(ip)
+            return time.perf_counter() - started
+
+        elapsed = asyncio.run(remote())
+        remote_rate = args.http / elapsed
+        print(f"{'remote (ip-api.com)':<28} {args.http:>8} lookups  {elapsed * 1000:>10.1f} ms  "
+              f"{remote_rate:>14,.1f} lookups/s")
+        print(f"Offline lookup is {offline_rate / remote_rate:,.0f}x faster than the remote API")
+
+if __name__ == "__main__":
+    main()
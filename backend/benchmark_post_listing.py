@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Post Listing Benchmark Script
+Builds a synthetic table of long-form posts and compares a listing page
+served as full Post schemas (content loaded and serialized) against the
+PostSummary projection (content column deferred), for payload size and
+query + serialization latency.
+
+Usage:
+    python benchmark_post_listing.py
+    python benchmark_post_listing.py --posts 5000 --content-kb 50 --limit 50
+"""
+
+import sys
+import os
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, desc
+from sqlalchemy.orm import sessionmaker, defer
+
+from database import Base
+from models.post import Post
+from models.category import Category
+from schemas.post import Post as PostSchema, PostList
+
+WORDS = (
+    "digital forensic evidence analysis mobile device recovery court report "
+    "timeline artifact acquisition investigation malware network memory disk"
+).split()
+
+class FullPostList(PostList):
+    """The listing shape before PostSummary: full posts with content"""
+    posts: List[PostSchema]
+
+def build_dataset(engine, posts: int, content_kb: int):
+    Base.metadata.create_all(bind=engine)
+    paragraph_words = 120
+    paragraphs = max(1, content_kb * 1024 // (paragraph_words * 9))
+    start = datetime(2022, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(Category.__table__.insert(), [
+            {"id": i, "name": f"Category {i}", "slug": f"category-{i}"} for i in range(1, 6)
+        ])
+        batch = []
+        for i in range(posts):
+            content = "".join(
+                "<p>" + " ".join(random.choices(WORDS, k=paragraph_words)) + "</p>"
+                for _ in range(paragraphs)
+            )
+            batch.append({
+                "title": " ".join(random.choices(WORDS, k=6)).title(),
+                "slug": f"post-{i}",
+                "content": content,
+                "excerpt": " ".join(random.choices(WORDS, k=30)),
+                "thumbnail_url": f"/static/uploads/{i}.jpg",
+                "tags": ",".join(random.sample(WORDS, 3)),
+                "category_id": random.randint(1, 5),
+                "is_published": True,
+                "view_count": random.randint(0, 5000),
+                "created_at": start + timedelta(hours=i),
+            })
+            if len(batch) == 500:
+                connection.execute(Post.__table__.insert(), batch)
+                batch.clear()
+        if batch:
+            connection.execute(Post.__table__.insert(), batch)
+
+def full_page(session, limit: int, page: int) -> bytes:
+    posts = session.query(Post).filter(Post.is_published == True).order_by(
+        desc(Post.created_at), desc(Post.id)
+    ).offset((page - 1) * limit).limit(limit).all()
+    return FullPostList(posts=posts, total=0, page=page, limit=limit, total_pages=0).model_dump_json().encode()
+
+def summary_page(session, limit: int, page: int) -> bytes:
+    posts = session.query(Post).options(defer(Post.content, raiseload=True)).filter(
+        Post.is_published == True
+    ).order_by(desc(Post.created_at), desc(Post.id)).offset((page - 1) * limit).limit(limit).all()
+    return PostList(posts=posts, total=0, page=page, limit=limit, total_pages=0).model_dump_json().encode()
+
+def measure(session_factory, fn, limit: int, pages: int):
+    """Median latency over `pages` distinct pages, each in a fresh session"""
+    timings = []
+    size = 0
+    for page in range(1, pages + 1):
+        session = session_factory()
+        t0 = time.perf_counter()
+        body = fn(session, limit, page)
+        timings.append((time.perf_counter() - t0) * 1000)
+        size = max(size, len(body))
+        session.close()
+    timings.sort()
+    return size, timings[len(timings) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description="Full Post vs PostSummary listing benchmark")
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--content-kb", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        session_factory = sessionmaker(bind=engine)
+
+        t0 = time.perf_counter()
+        build_dataset(engine, args.posts, args.content_kb)
+        print(f"Generated {args.posts:,} posts (~{args.content_kb} KB content each) "
+              f"in {time.perf_counter() - t0:.1f}s")
+        print()
+
+        print(f"{'limit':>6} {'full KB':>9} {'full ms':>9} {'summary KB':>11} {'summary ms':>11} {'size':>7} {'speedup':>8}")
+        for limit in sorted({args.limit, 50, 100}):
+            full_size, full_ms = measure(session_factory, full_page, limit, args.pages)
+            summary_size, summary_ms = measure(session_factory, summary_page, limit, args.pages)
+            print(f"{limit:>6} {full_size / 1024:>9.1f} {full_ms:>9.2f} {summary_size / 1024:>11.1f} "
+                  f"{summary_ms:>11.2f} {summary_size / full_size:>6.1%} {full_ms / summary_ms:>7.1f}x")
+
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
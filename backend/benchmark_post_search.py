@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Post Search Benchmark Script
+Builds synthetic posts tables (10k and 100k posts by default) and compares
+the original contains() (LIKE '%x%') scan against the SQLite FTS5 index and
+the in-process BM25 index, for the count + first page that /api/posts runs.
+
+Usage:
+    python benchmark_post_search.py
+    python benchmark_post_search.py --sizes 10000 --words 600
+"""
+
+import sys
+import os
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, desc, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models.post import Post
+from models.category import Category  # noqa: F401 (Post.category relationship)
+from services import post_search
+from services.search_index import SearchIndex, INDEX_COLUMNS
+
+ENGLISH = (
+    "forensic evidence mobile android iphone cloud storage email recovery deleted "
+    "analysis court expert witness hash image disk memory network log timeline "
+    "malware incident response investigation report chain custody device data "
+    "extraction acquisition artifact registry browser history message backup"
+).split()
+KOREAN = (
+    "디지털 포렌식 증거 분석 복구 삭제 데이터 휴대폰 클라우드 이메일 법원 "
+    "전문가 감정 보고서 사건 조사 악성코드 로그 기록 메신저 카카오톡 백업"
+).split()
+FILLER = "the of and to in for with on is are was from by this that which".split()
+PARTICLES = ["", "", "은", "는", "을", "를", "의", "에서", "으로"]
+SYLLABLES = "ka ri mo ten sul vor pa li ne do zu ran kel mi to bas".split()
+
+def build_vocabulary(size: int):
+    """Domain words first (most frequent), then a long tail of pseudo-words"""
+    vocabulary = ENGLISH[:10] + KOREAN[:6] + ENGLISH[10:] + KOREAN[6:]
+    seen = set(vocabulary)
+    while len(vocabulary) < size:
+        word = "".join(random.choice(SYLLABLES) for _ in range(random.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+VOCABULARY = []
+
+def pick_word() -> str:
+    # Zipf-like ranks: a handful of very common words, a long tail of rare ones
+    rank = min(int(random.paretovariate(0.8)) - 1, len(VOCABULARY) - 1)
+    word = VOCABULARY[rank]
+    if word in KOREAN:
+        word += random.choice(PARTICLES)
+    return word
+
+def make_paragraph(words: int) -> str:
+    return " ".join(
+        random.choice(FILLER) if random.random() < 0.4 else pick_word()
+        for _ in range(words)
+    )
+
+def build_dataset(engine, posts: int, words: int):
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2020, 1, 1)
+    batch = []
+    with engine.begin() as connection:
+        for i in range(posts):
+            paragraphs = "".join(f"<p>{make_paragraph(words // 4)}</p>" for _ in range(4))
+            batch.append({
+                "title": make_paragraph(6).title(),
+                "slug": f"post-{i}",
+                "content": paragraphs,
+                "excerpt": make_paragraph(25),
+                "tags": ",".join(random.sample(ENGLISH, 3)),
+                "category_id": random.randint(1, 5),
+                "is_published": True,
+                "view_count": 0,
+                "created_at": start + timedelta(minutes=i * 7),
+            })
+            if len(batch) == 2000:
+                connection.execute(Post.__table__.insert(), batch)
+                batch.clear()
+        if batch:
+            connection.execute(Post.__table__.insert(), batch)
+
+def timed(fn, repeat: int = 3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - t0) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def like_search(session, term):
+    query = session.query(Post).filter(Post.is_published == True).filter(
+        Post.title.contains(term) | Post.content.contains(term) | Post.excerpt.contains(term)
+    )
+    total = query.count()
+    query.order_by(desc(Post.created_at)).limit(10).all()
+    return total
+
+def fts_search(session, term):
+    query, snippet = post_search.apply_post_search(
+        session.query(Post).filter(Post.is_published == True), term
+    )
+    total = query.count()
+    query.order_by(desc(Post.created_at)).limit(10).add_columns(snippet).all()
+    return total
+
+def index_search(session, index, term):
+    ranked = index.search(term)
+    page_ids = ranked[:10]
+    if page_ids:
+        session.query(Post).filter(Post.id.in_(page_ids)).all()
+    return len(ranked)
+
+def run(size: int, words: int, queries):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        session = sessionmaker(bind=engine)()
+
+        t0 = time.perf_counter()
+        build_dataset(engine, size, words)
+        print(f"Generated {size:,} posts (~{words} words each) in {time.perf_counter() - t0:.1f}s")
+
+        t0 = time.perf_counter()
+        fts_ready = post_search.ensure_post_search_index(engine)
+        print(f"FTS5 index: {'built' if fts_ready else 'unavailable'} in {time.perf_counter() - t0:.1f}s")
+
+        index = SearchIndex()
+        t0 = time.perf_counter()
+        with engine.connect() as connection:
+            index.build(connection.execute(select(*INDEX_COLUMNS)))
+        stats = index.stats()
+        print(f"In-process index: {stats['terms']:,} terms, {stats['postings']:,} postings "
+              f"in {time.perf_counter() - t0:.1f}s")
+        print()
+
+        print(f"{'query':<24} {'like hits':>10} {'like ms':>9} {'fts hits':>9} {'fts ms':>8} {'idx hits':>9} {'idx ms':>8}")
+        for term in queries:
+            like_total, like_ms = timed(lambda: like_search(session, term))
+            fts_total, fts_ms = timed(lambda: fts_search(session, term)) if fts_ready else (0, 0.0)
+            index_total, index_ms = timed(lambda: index_search(session, index, term))
+            print(f"{term:<24} {like_total:>10,} {like_ms:>9.1f} {fts_total:>9,} {fts_ms:>8.1f} "
+                  f"{index_total:>9,} {index_ms:>8.1f}")
+        print()
+        print("LIKE matches the whole query as one substring; FTS and the index match")
+        print("posts containing every word (or word prefix), so hit counts differ.")
+        print()
+
+        session.close()
+        engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description="LIKE vs FTS5 vs in-process BM25 post search benchmark")
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(",")], default=[10000, 100000])
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    VOCABULARY.extend(build_vocabulary(30000))
+    queries = [
+        "forensic",                         # very common
+        "evidence recovery",                # two common words
+        VOCABULARY[300],                    # mid-frequency
+        VOCABULARY[5000],                   # rare
+        "디지털 포렌식",                      # Korean, with particles in the text
+        f"{VOCABULARY[60]} {VOCABULARY[400]}",
+        "nonexistentterm",
+    ]
+    for size in args.sizes:
+        run(size, args.words, queries)
+
+if __name__ == "__main__":
+    main()
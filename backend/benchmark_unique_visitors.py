@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unique Visitor Benchmark Script
+Builds a synthetic visits table and compares the exact
+COUNT(DISTINCT ip_address) answer against HyperLogLog sketches
+(one per day, merged for week/month/all-time ranges).
+
+Usage:
+    python benchmark_unique_visitors.py                       # 2M rows, 90 days
+    python benchmark_unique_visitors.py --rows 5000000 --visitors 800000
+"""
+
+import sys
+import os
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.visit_sketches import SKETCH_PRECISION
+from utils.hyperloglog import HyperLogLog
+
+def build_dataset(conn: sqlite3.Connection, rows: int, visitors: int, days: int, start: date):
+    conn.execute("CREATE TABLE visits (id INTEGER PRIMARY KEY, ip_address VARCHAR(45), created_at DATETIME)")
+    conn.execute("CREATE INDEX ix_visits_created_at ON visits (created_at)")
+
+    # Skewed visitor popularity: a few heavy returners, a long tail of one-off visits
+    pool = [f"{random.randint(1, 223)}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
+            for _ in range(visitors)]
+    batch = []
+    for _ in range(rows):
+        ip = pool[min(int(random.paretovariate(1.1)) - 1, visitors - 1) if random.random() < 0.5
+                  else random.randrange(visitors)]
+        day = start + timedelta(days=random.randrange(days))
+        batch.append((ip, f"{day.isoformat()} {random.randrange(24):02d}:{random.randrange(60):02d}:00"))
+        if len(batch) == 50000:
+            conn.executemany("INSERT INTO visits (ip_address, created_at) VALUES (?, ?)", batch)
+            batch.clear()
+    if batch:
+        conn.executemany("INSERT INTO visits (ip_address, created_at) VALUES (?, ?)", batch)
+    conn.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description="HyperLogLog vs exact COUNT(DISTINCT) benchmark")
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--visitors", type=int, default=400000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    start = date(2024, 1, 1)
+    end = start + timedelta(days=args.days - 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+
+        t0 = time.perf_counter()
+        build_dataset(conn, args.rows, args.visitors, args.days, start)
+        print(f"Generated {args.rows:,} visits over {args.days} days in {time.perf_counter() - t0:.1f}s")
+
+        # Build one sketch per day
+        t0 = time.perf_counter()
+        sketches = {}
+        for ip, day in conn.execute("SELECT ip_address, substr(created_at, 1, 10) FROM visits"):
+            sketch = sketches.get(day)
+            if sketch is None:
+                sketch = sketches[day] = HyperLogLog(SKETCH_PRECISION)
+            sketch.add(ip)
+        elapsed = time.perf_counter() - t0
+        blobs = {day: sketch.to_bytes() for day, sketch in sketches.items()}
+        print(f"Built {len(blobs)} daily sketches in {elapsed:.1f}s ({args.rows / elapsed:,.0f} adds/s), "
+              f"{sum(map(len, blobs.values())) / 1024:.0f} KB total")
+        print()
+
+        ranges = [
+            ("day", end, end),
+            ("week", end - timedelta(days=6), end),
+            ("month", end - timedelta(days=29), end),
+            ("all time", start, end),
+        ]
+        print(f"{'range':<10} {'exact':>10} {'sql ms':>10} {'estimate':>10} {'hll ms':>10} {'error':>8}")
+        for label, range_start, range_end in ranges:
+            t0 = time.perf_counter()
+            exact = conn.execute(
+                "SELECT COUNT(DISTINCT ip_address) FROM visits WHERE created_at >= ? AND created_at < ?",
+                (range_start.isoformat(), (range_end + timedelta(days=1)).isoformat())
+            ).fetchone()[0]
+            sql_ms = (time.perf_counter() - t0) * 1000
+
+            t0 = time.perf_counter()
+            merged = HyperLogLog(SKETCH_PRECISION)
+            day = range_start
+            while day <= range_end:
+                blob = blobs.get(day.isoformat())
+                if blob:
+                    merged.merge(HyperLogLog.from_bytes(blob))
+                day += timedelta(days=1)
+            estimate = merged.count()
+            hll_ms = (time.perf_counter() - t0) * 1000
+
+            error = (estimate - exact) / exact * 100 if exact else 0.0
+            print(f"{label:<10} {exact:>10,} {sql_ms:>10.1f} {estimate:>10,} {hll_ms:>10.2f} {error:>7.2f}%")
+
+        conn.close()
+
+if __name__ == "__main__":
+    main()
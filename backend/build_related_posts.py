@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Related Posts Batch Job
+Recomputes the related_posts table from every published post (TF-IDF
+vectors, top-k cosine neighbours). The API server also runs this at
+startup and updates single posts on admin writes; run it by hand or from
+cron after bulk imports, or to refresh IDF weights.
+
+Usage:
+    python build_related_posts.py
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import engine
+from models.related_post import RelatedPost
+from services.related_posts import related_posts, rebuild_related_posts
+
+def main():
+    print("Building related posts...")
+    
+    try:
+        RelatedPost.__table__.create(bind=engine, checkfirst=True)
+        started = time.perf_counter()
+        posts = rebuild_related_posts()
+    except Exception as e:
+        print(f"Error building related posts: {e}")
+        return False
+    
+    stats = related_posts.stats()
+    print(f"✓ {posts} posts, {stats['terms']} terms in {time.perf_counter() - started:.1f}s")
+    print("✓ Related posts build completed successfully!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Static Snapshot Export Script
+Renders published posts, the paginated post listings (all posts and per
+category) and the categories list as static JSON files mirroring the
+/api/posts and /api/categories responses, under SNAPSHOT_DIR/<version>/,
+and points SNAPSHOT_DIR/current at the new version. Nginx or a CDN can
+serve the public read API from there (see DEPLOYMENT.md).
+
+Usage:
+    python export_snapshot.py               # full build into a new version
+    python export_snapshot.py --post-id 42  # update the current version for one post
+    python export_snapshot.py --status      # show the current version
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import SessionLocal
+from services.static_snapshot import SNAPSHOT_DIR, build_snapshot, update_snapshot_post, snapshot_status
+
+def main(args) -> bool:
+    if args.status:
+        print(json.dumps(snapshot_status(), indent=2))
+        return True
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if args.post_id is not None:
+            touched = update_snapshot_post(db, args.post_id)
+            if not touched and snapshot_status()["current"] is None:
+                print("❌ No current snapshot; run a full build first")
+                return False
+            print(f"✓ Post {args.post_id}: {len(touched)} files updated in {time.perf_counter() - started:.2f}s")
+            for path in touched:
+                print(f"  - {path}")
+        else:
+            result = build_snapshot(db)
+            print(f"✓ Snapshot {result['version']}: {result['posts']} posts, {result['files']} files "
+                  f"in {time.perf_counter() - started:.1f}s")
+            print(f"✓ {os.path.join(SNAPSHOT_DIR, 'current')} -> {result['version']}")
+    except Exception as e:
+        print(f"❌ Snapshot export failed: {e}")
+        return False
+    finally:
+        db.close()
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export published content as static JSON")
+    parser.add_argument("--post-id", type=int, help="only update the files affected by this post")
+    parser.add_argument("--status", action="store_true", help="print the current snapshot version")
+    success = main(parser.parse_args())
+    exit(0 if success else 1)
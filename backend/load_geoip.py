@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+GeoIP Loader Script
+Converts an IP-range CSV (IP2Location LITE DB1 / DB-IP country lite style:
+start,end,country_code[,country_name]) into the compact binary table used
+for offline visitor geolocation.
+
+Usage:
+    python load_geoip.py IP2LOCATION-LITE-DB1.CSV [IP2LOCATION-LITE-DB1.IPV6.CSV ...]
+    python load_geoip.py dbip-country-lite.csv --output data/geoip.bin
+"""
+
+import sys
+import os
+import argparse
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.geoip import IPRangeTable, GEOIP_DB_PATH
+
+def load_geoip(csv_paths, output_path):
+    started = time.perf_counter()
+
+    for path in csv_paths:
+        print(f"Reading {path}...")
+    table = IPRangeTable.from_csv(*csv_paths)
+    table.save(output_path)
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ Wrote {len(table.v4_starts)} IPv4 and {len(table.v6_starts)} IPv6 ranges "
+          f"({len(table.countries)} countries) to {output_path} in {elapsed:.1f}s")
+    print(f"  File size: {os.path.getsize(output_path) / 1024:.0f} KB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the offline GeoIP range table")
+    parser.add_argument("csv", nargs="+", help="IP range CSV file(s)")
+    parser.add_argument("--output", default=GEOIP_DB_PATH, help=f"output file (default: {GEOIP_DB_PATH})")
+    args = parser.parse_args()
+
+    load_geoip(args.csv, args.output)
@@ -7,8 +7,17 @@ from slowapi.errors import RateLimitExceeded
 import os
 from dotenv import load_dotenv
 
-from database import engine, Base
-from routers import posts, categories, inquiries, admin_auth, admin_posts, admin_inquiries, admin_categories, admin_dashboard, upload, tracking, site_settings
+from database import engine, Base, SessionLocal
+from routers import posts, categories, tags, feeds, inquiries, admin_auth, admin_posts, admin_inquiries, admin_categories, admin_dashboard, admin_snapshot, upload, tracking, site_settings
+from services.visit_ingest import visit_ingest
+from services.visit_rollups import apply_visit_rollups
+from services.post_search import ensure_post_search_index, wants_search_index
+from services.search_index import start_post_index_build
+from services.related_posts import start_related_posts_build
+from services import post_tags  # noqa: F401 - registers the Post -> post_tags sync hooks
+from services.post_views import post_views
+from services.category_registry import category_registry
+from utils.geolocation import open_http_client, close_http_client
 
 load_dotenv()
 
@@ -69,18 +78,52 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Full-text index for post search (SQLite FTS5; other backends use LIKE)
+ensure_post_search_index(engine)
+
+# Keep daily visit rollups up to date as visits are flushed
+visit_ingest.add_flush_hook(apply_visit_rollups)
+
 # Include routers
 app.include_router(posts.router, prefix="/api", tags=["posts"])
 app.include_router(categories.router, prefix="/api", tags=["categories"])
+app.include_router(tags.router, prefix="/api", tags=["tags"])
 app.include_router(inquiries.router, prefix="/api", tags=["inquiries"])
 app.include_router(admin_auth.router, prefix="/api/admin", tags=["admin_auth"])
 app.include_router(admin_posts.router, prefix="/api/admin", tags=["admin_posts"])
 app.include_router(admin_inquiries.router, prefix="/api/admin", tags=["admin_inquiries"])
 app.include_router(admin_categories.router, prefix="/api/admin", tags=["admin_categories"])
 app.include_router(admin_dashboard.router, prefix="/api/admin", tags=["admin_dashboard"])
+app.include_router(admin_snapshot.router, prefix="/api/admin", tags=["admin_snapshot"])
 app.include_router(upload.router, prefix="/api/admin", tags=["upload"])
 app.include_router(tracking.router, prefix="/api", tags=["tracking"])
 app.include_router(site_settings.router)
+app.include_router(feeds.router, tags=["feeds"])
+
+@app.on_event("startup")
+async def startup():
+    await open_http_client()
+    visit_ingest.start()
+    post_views.start()
+    
+    db = SessionLocal()
+    try:
+        category_registry.refresh(db)
+    finally:
+        db.close()
+    
+    if wants_search_index():
+        start_post_index_build()
+    
+    # Related posts: full recompute, then kept current by the admin post handlers
+    start_related_posts_build()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Write out any buffered visits and post views before the process exits
+    visit_ingest.stop()
+    post_views.stop()
+    await close_http_client()
 
 @app.get("/")
 async def root():
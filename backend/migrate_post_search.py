@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the SQLite FTS5 index used by post search,
+and to rebuild it from the posts table.
+
+Run it once after upgrading, and again after any bulk change to posts
+made outside the ORM (raw SQL, query.update()), which bypasses the
+index maintenance hooks.
+
+Usage:
+    python migrate_post_search.py
+"""
+
+from database import engine
+from services.post_search import ensure_post_search_index, rebuild_post_search_index
+
+def main():
+    print("Running post search index migration...")
+    
+    if not ensure_post_search_index(engine):
+        print("✗ FTS5 is not available on this database; search will use LIKE")
+        return False
+    
+    try:
+        with engine.begin() as connection:
+            indexed = rebuild_post_search_index(connection)
+    except Exception as e:
+        print(f"Error rebuilding search index: {e}")
+        return False
+    
+    print(f"✓ Indexed {indexed} posts")
+    print("✓ Post search index migration completed successfully!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
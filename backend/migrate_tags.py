@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the tags / post_tags tables and fill them by
+parsing every post's tags column (JSON list or comma-separated).
+
+Run it once after upgrading, and again after any bulk change to posts
+made outside the ORM (raw SQL, query.update()), which bypasses the
+tag maintenance hooks.
+
+Usage:
+    python migrate_tags.py
+"""
+
+from database import engine
+from models.tag import Tag, PostTag
+from services.post_tags import rebuild_post_tags
+
+def main():
+    print("Running tag index migration...")
+    
+    try:
+        Tag.__table__.create(bind=engine, checkfirst=True)
+        PostTag.__table__.create(bind=engine, checkfirst=True)
+        print("✓ tags and post_tags tables ready")
+        
+        with engine.begin() as connection:
+            links = rebuild_post_tags(connection)
+            tags = connection.execute(Tag.__table__.select().where(Tag.post_count > 0)).all()
+    except Exception as e:
+        print(f"Error building tag index: {e}")
+        return False
+    
+    print(f"✓ Linked {links} post tags across {len(tags)} tags in use")
+    print("✓ Tag index migration completed successfully!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Migration script to add created_at indexes used by the date-range stats
+queries (dashboard, inquiry and analytics counts)
+"""
+
+from sqlalchemy import text
+from database import engine
+
+INDEXES = [
+    ("ix_posts_created_at", "posts"),
+    ("ix_inquiries_created_at", "inquiries"),
+    ("ix_visits_created_at", "visits"),
+]
+
+def create_time_indexes():
+    """Create created_at indexes if they don't exist"""
+    try:
+        with engine.connect() as connection:
+            for index_name, table in INDEXES:
+                connection.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} (created_at)"
+                ))
+                print(f"✓ {index_name}")
+            
+            connection.commit()
+            
+    except Exception as e:
+        print(f"Error creating indexes: {e}")
+        return False
+    
+    return True
+
+def main():
+    print("Running created_at index migration...")
+    
+    if create_time_indexes():
+        print("✓ Index migration completed successfully!")
+    else:
+        print("✗ Index migration failed!")
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -3,5 +3,7 @@ from .category import Category
 from .post import Post
 from .inquiry import Inquiry
 from .site_settings import SiteSettings
+from .tag import Tag, PostTag
+from .related_post import RelatedPost
 
-__all__ = ["Admin", "Category", "Post", "Inquiry", "SiteSettings"]
\ No newline at end of file
+__all__ = ["Admin", "Category", "Post", "Inquiry", "SiteSettings", "Tag", "PostTag", "RelatedPost"]
\ No newline at end of file
@@ -17,4 +17,4 @@ class Inquiry(Base):
     urgency_level = Column(String(20), default='normal', index=True)  # urgent, high, normal, low
     status = Column(String(20), default='new', index=True)  # new, read, responded, closed
     is_read = Column(Boolean, default=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
\ No newline at end of file
@@ -20,7 +20,7 @@ class Post(Base):
     source = Column(String(255))        # Press Settings > Source
     client_name = Column(String(255))   # Training Settings > Training Client Name  
     training_date = Column(String(50))  # Training Settings > Date
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     category = relationship("Category", back_populates="posts")
\ No newline at end of file
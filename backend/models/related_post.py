@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from database import Base
+
+class RelatedPost(Base):
+    """
+    Precomputed "related articles" for a post, best match first (rank 0).
+    Written by services/related_posts.py; the primary key serves the
+    per-post lookup in rank order.
+    """
+    __tablename__ = "related_posts"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    related_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)  # Cosine similarity of the TF-IDF vectors
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from database import Base
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)  # Spelling of the first post that used it
+    slug = Column(String(100), unique=True, index=True, nullable=False)
+    # Published posts carrying this tag, maintained by services/post_tags.py
+    post_count = Column(Integer, nullable=False, default=0)
+
+class PostTag(Base):
+    """Post <-> tag association, derived from Post.tags"""
+    __tablename__ = "post_tags"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+    # Tag pages: posts for a tag without scanning the primary key order
+    __table_args__ = (Index("ix_post_tags_tag_id_post_id", "tag_id", "post_id"),)
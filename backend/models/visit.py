@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Date, LargeBinary
 from sqlalchemy.sql import func
 from database import Base
-from datetime import datetime
+from datetime import datetime, date
 import pytz
 
 # Korea Standard Time
@@ -11,6 +11,16 @@ def get_kst_now():
     """Get current time in KST"""
     return datetime.now(KST)
 
+def kst_datetime(value: datetime) -> datetime:
+    """Visit timestamp as KST wall time (naive values are already KST)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(KST)
+    return value
+
+def kst_date(value: datetime) -> date:
+    """KST calendar day of a visit timestamp"""
+    return kst_datetime(value).date()
+
 class Visit(Base):
     __tablename__ = "visits"
     
@@ -21,4 +31,46 @@ class Visit(Base):
     country_code = Column(String(2))
     country_name = Column(String(100))
     user_agent = Column(String(500))
-    created_at = Column(DateTime(timezone=True), default=get_kst_now, index=True)
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), default=get_kst_now, index=True)
+
+# Daily rollups, maintained incrementally by services/visit_rollups.py.
+# Days are KST calendar days; unknown countries are stored as "".
+
+class VisitDailyCountry(Base):
+    __tablename__ = "visit_daily_countries"
+
+    day = Column(Date, primary_key=True)
+    country_code = Column(String(2), primary_key=True)
+    country_name = Column(String(100))
+    visits = Column(Integer, nullable=False, default=0)
+    unique_visitors = Column(Integer, nullable=False, default=0)
+
+class VisitDailyPage(Base):
+    __tablename__ = "visit_daily_pages"
+
+    day = Column(Date, primary_key=True)
+    page_path = Column(String(500), primary_key=True)
+    visits = Column(Integer, nullable=False, default=0)
+
+class VisitHourly(Base):
+    __tablename__ = "visit_hourly"
+
+    day = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True)  # 0-23, KST
+    visits = Column(Integer, nullable=False, default=0)
+
+class VisitDailyVisitor(Base):
+    __tablename__ = "visit_daily_visitors"
+
+    day = Column(Date, primary_key=True)
+    ip_address = Column(String(45), primary_key=True)
+    country_code = Column(String(2), nullable=False, default="", index=True)
+
+class VisitSketch(Base):
+    """HyperLogLog sketch of visitor IPs for one scope/key"""
+    __tablename__ = "visit_sketches"
+
+    scope = Column(String(10), primary_key=True)  # day, week, month, country, total
+    key = Column(String(20), primary_key=True)    # 2024-01-31, 2024-01-29 (Monday), 2024-01, KR, all
+    sketch = Column(LargeBinary, nullable=False)
+    estimate = Column(Integer, nullable=False, default=0, index=True)
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
 
 from database import get_db
 from auth import get_current_admin
 from models.category import Category
+from models.post import Post
 from models.admin import Admin
 from schemas.category import Category as CategorySchema, CategoryCreate, CategoryUpdate
+from services.response_cache import response_cache
+from services.site_feeds import site_feeds
+from services.static_snapshot import rebuild_snapshot
+from services.category_registry import category_registry
 
 router = APIRouter()
 
@@ -21,6 +27,7 @@ async def get_admin_categories(
 @router.post("/categories", response_model=CategorySchema)
 async def create_category(
     category: CategoryCreate,
+    background_tasks: BackgroundTasks,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -38,6 +45,11 @@ async def create_category(
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    category_registry.refresh(db)
+    response_cache.invalidate()
+    site_feeds.invalidate()
+    # Full snapshot build after the response, in the threadpool
+    background_tasks.add_task(rebuild_snapshot)
     
     return db_category
 
@@ -45,6 +57,7 @@ async def create_category(
 async def update_category(
     category_id: int,
     category: CategoryUpdate,
+    background_tasks: BackgroundTasks,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -70,12 +83,18 @@ async def update_category(
     
     db.commit()
     db.refresh(db_category)
+    category_registry.refresh(db)
+    response_cache.invalidate()
+    site_feeds.invalidate()
+    # Full snapshot build after the response, in the threadpool
+    background_tasks.add_task(rebuild_snapshot)
     
     return db_category
 
 @router.delete("/categories/{category_id}")
 async def delete_category(
     category_id: int,
+    background_tasks: BackgroundTasks,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -84,13 +103,20 @@ async def delete_category(
         raise HTTPException(status_code=404, detail="Category not found")
     
     # Check if category has posts - prevent deletion if it does
-    if db_category.posts:
+    # (one COUNT in the database, rather than loading every post row through db_category.posts)
+    post_total = db.query(func.count(Post.id)).filter(Post.category_id == category_id).scalar()
+    if post_total:
         raise HTTPException(
             status_code=400, 
-            detail=f"Cannot delete category '{db_category.name}' - it has {len(db_category.posts)} posts. Please reassign or delete the posts first."
+            detail=f"Cannot delete category '{db_category.name}' - it has {post_total} posts. Please reassign or delete the posts first."
         )
     
     db.delete(db_category)
     db.commit()
+    category_registry.refresh(db)
+    response_cache.invalidate()
+    site_feeds.invalidate()
+    # Full snapshot build after the response, in the threadpool
+    background_tasks.add_task(rebuild_snapshot)
     
     return {"message": "Category deleted successfully"}
\ No newline at end of file
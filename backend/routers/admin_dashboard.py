@@ -9,6 +9,8 @@ from auth import get_current_admin
 from models.admin import Admin
 from models.post import Post
 from models.inquiry import Inquiry
+from services.post_counts import post_counts
+from utils.time_ranges import kst_month, last_days
 
 router = APIRouter()
 
@@ -19,39 +21,31 @@ async def get_dashboard_stats(
 ):
     """Get dashboard statistics"""
     
-    # Get current date ranges
-    now = datetime.utcnow()
-    current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
-    last_month_end = current_month_start - timedelta(seconds=1)
-    week_ago = now - timedelta(days=7)
+    # Get current date ranges (KST calendar, compared as UTC like created_at)
+    this_month = kst_month()
+    last_month = kst_month(this_month.start.date() - timedelta(days=1))
+    this_month_utc = this_month.utc()
+    last_month_utc = last_month.utc()
+    this_week = last_days(7)
+    last_week = last_days(7, now=this_week.start)
     
     # Posts statistics
-    total_posts = db.query(Post).count()
-    published_posts = db.query(Post).filter(Post.is_published == True).count()
-    posts_this_month = db.query(Post).filter(Post.created_at >= current_month_start).count()
-    posts_last_month = db.query(Post).filter(
-        Post.created_at >= last_month_start,
-        Post.created_at <= last_month_end
-    ).count()
+    total_posts = post_counts.total(db)
+    published_posts = post_counts.total(db, published=True)
+    posts_this_month = db.query(Post).filter(this_month_utc.filter(Post.created_at)).count()
+    posts_last_month = db.query(Post).filter(last_month_utc.filter(Post.created_at)).count()
     
     # Inquiries statistics
     total_inquiries = db.query(Inquiry).count()
-    inquiries_this_month = db.query(Inquiry).filter(Inquiry.created_at >= current_month_start).count()
-    inquiries_last_month = db.query(Inquiry).filter(
-        Inquiry.created_at >= last_month_start,
-        Inquiry.created_at <= last_month_end
-    ).count()
+    inquiries_this_month = db.query(Inquiry).filter(this_month_utc.filter(Inquiry.created_at)).count()
+    inquiries_last_month = db.query(Inquiry).filter(last_month_utc.filter(Inquiry.created_at)).count()
     
     # Views statistics
     total_views = db.query(func.sum(Post.view_count)).scalar() or 0
     
     # Recent activity (posts created this week)
-    recent_activity = db.query(Post).filter(Post.created_at >= week_ago).count()
-    activity_last_week = db.query(Post).filter(
-        Post.created_at >= (week_ago - timedelta(days=7)),
-        Post.created_at < week_ago
-    ).count()
+    recent_activity = db.query(Post).filter(this_week.utc().filter(Post.created_at)).count()
+    activity_last_week = db.query(Post).filter(last_week.utc().filter(Post.created_at)).count()
     
     # Calculate percentage changes
     def calculate_change(current: int, previous: int) -> Dict[str, Any]:
@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc
 from typing import List
 import math
-from datetime import datetime, date
 
 from database import get_db
 from auth import get_current_admin
 from models.inquiry import Inquiry
 from models.admin import Admin
 from schemas.inquiry import Inquiry as InquirySchema, InquiryStats, InquiryUpdate
+from utils.time_ranges import kst_day
 
 router = APIRouter()
 
@@ -48,8 +48,9 @@ async def get_inquiry_stats(
 ):
     total = db.query(Inquiry).count()
     unread = db.query(Inquiry).filter(Inquiry.is_read == False).count()
+    # created_at is filled by the database clock (UTC)
     today = db.query(Inquiry).filter(
-        func.date(Inquiry.created_at) == date.today()
+        kst_day().utc().filter(Inquiry.created_at)
     ).count()
     
     return InquiryStats(total=total, unread=unread, today=today)
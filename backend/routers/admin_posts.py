@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session, defer, joinedload, selectinload
 from sqlalchemy import desc
-from typing import List
+from typing import List, Optional
 import math
 
 from database import get_db
@@ -9,25 +9,76 @@ from auth import get_current_admin
 from models.post import Post
 from models.admin import Admin
 from schemas.post import Post as PostSchema, PostCreate, PostUpdate, PostList
+from services.search_index import post_index
+from services.related_posts import related_posts
+from services.response_cache import response_cache
+from services.site_feeds import site_feeds
+from services.static_snapshot import refresh_snapshot_post
+from services.post_counts import post_counts
+from utils.pagination import encode_cursor, decode_cursor, keyset_before
 
 router = APIRouter()
 
+def sync_post_caches(
+    background_tasks: BackgroundTasks,
+    db_post: Optional[Post] = None,
+    deleted_id: Optional[int] = None
+):
+    """
+    Bring in-memory search, related posts, counts, feeds, cached responses
+    and the static snapshot (if enabled) up to date after a post write.
+    The snapshot files are rewritten after the response, in the threadpool.
+    """
+    if db_post is not None:
+        post_index.index_post(db_post)
+        related_posts.refresh_post(db_post)
+    if deleted_id is not None:
+        post_index.remove_post(deleted_id)
+        related_posts.remove_post(deleted_id)
+    post_counts.invalidate()
+    response_cache.invalidate()
+    site_feeds.invalidate()
+    background_tasks.add_task(refresh_snapshot_post, db_post.id if db_post is not None else deleted_id)
+
 @router.get("/posts", response_model=PostList)
 async def get_admin_posts(
     page: int = 1,
     limit: int = 10,
+    cursor: Optional[str] = None,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
-    total = db.query(Post).count()
-    posts = db.query(Post).order_by(desc(Post.created_at)).offset((page - 1) * limit).limit(limit).all()
+    """
+    All posts as summaries (no content), newest first. Pass the returned
+    next_cursor instead of page for keyset pagination.
+    """
+    total = post_counts.total(db)
+    query = db.query(Post).options(defer(Post.content, raiseload=True), selectinload(Post.category))
+    
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(keyset_before(Post.created_at, Post.id, position))
+    
+    query = query.order_by(desc(Post.created_at), desc(Post.id))
+    if not cursor:
+        query = query.offset((page - 1) * limit)
+    
+    posts = query.limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
     
     return PostList(
         posts=posts,
         total=total,
         page=page,
         limit=limit,
-        total_pages=math.ceil(total / limit)
+        total_pages=math.ceil(total / limit),
+        next_cursor=next_cursor
     )
 
 @router.get("/posts/{post_id}", response_model=PostSchema)
@@ -36,7 +87,7 @@ async def get_post(
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    db_post = db.query(Post).options(joinedload(Post.category)).filter(Post.id == post_id).first()
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found")
     
@@ -45,6 +96,7 @@ async def get_post(
 @router.post("/posts", response_model=PostSchema)
 async def create_post(
     post: PostCreate,
+    background_tasks: BackgroundTasks,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -57,6 +109,7 @@ async def create_post(
     db.add(db_post)
     db.commit()
     db.refresh(db_post)
+    sync_post_caches(background_tasks, db_post)
     
     return db_post
 
@@ -64,6 +117,7 @@ async def create_post(
 async def update_post(
     post_id: int,
     post: PostUpdate,
+    background_tasks: BackgroundTasks,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -83,12 +137,14 @@ async def update_post(
     
     db.commit()
     db.refresh(db_post)
+    sync_post_caches(background_tasks, db_post)
     
     return db_post
 
 @router.delete("/posts/{post_id}")
 async def delete_post(
     post_id: int,
+    background_tasks: BackgroundTasks,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -98,5 +154,6 @@ async def delete_post(
     
     db.delete(db_post)
     db.commit()
+    sync_post_caches(background_tasks, deleted_id=post_id)
     
     return {"message": "Post deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from database import get_db
+from auth import get_current_admin
+from models.admin import Admin
+from services.static_snapshot import build_snapshot, snapshot_status
+
+router = APIRouter()
+
+@router.get("/snapshot")
+async def get_snapshot_status(current_admin: Admin = Depends(get_current_admin)):
+    """Current static JSON snapshot version and when it was built/updated"""
+    return snapshot_status()
+
+@router.post("/snapshot")
+def build_static_snapshot(
+    current_admin: Admin = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Render all published content into a new snapshot version and make it
+    current. With SNAPSHOT_ENABLED, admin writes keep it up to date after that.
+    """
+    return build_snapshot(db)
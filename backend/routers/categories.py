@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from typing import List
 
 from database import get_db
-from models.category import Category
 from schemas.category import Category as CategorySchema
+from services.response_cache import response_cache
+from services.category_registry import category_registry
 
 router = APIRouter()
 
 @router.get("/categories", response_model=List[CategorySchema])
-async def get_categories(db: Session = Depends(get_db)):
-    categories = db.query(Category).all()
-    return categories
\ No newline at end of file
+async def get_categories(request: Request, db: Session = Depends(get_db)):
+    cached = response_cache.get(("categories",))
+    if cached:
+        return response_cache.respond(request, cached)
+    
+    generation = response_cache.generation
+    categories = category_registry.all(db)
+    return response_cache.respond(
+        request, response_cache.store(("categories",), categories, List[CategorySchema], generation)
+    )
\ No newline at end of file
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from database import get_db
+from services.site_feeds import site_feeds
+
+router = APIRouter()
+
+@router.get("/sitemap.xml")
+async def get_sitemap(request: Request, db: Session = Depends(get_db)):
+    """Sitemap of the public pages and published posts (pre-rendered, gzip-ready)"""
+    return site_feeds.respond(request, site_feeds.get(db, "sitemap.xml"))
+
+@router.get("/feed.xml")
+async def get_feed(request: Request, db: Session = Depends(get_db)):
+    """RSS 2.0 feed of the latest published posts (pre-rendered, gzip-ready)"""
+    return site_feeds.respond(request, site_feeds.get(db, "feed.xml"))
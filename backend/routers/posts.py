@@ -1,71 +1,220 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
-from typing import Optional
+from sqlalchemy import desc, and_, select
+from sqlalchemy.orm import defer, joinedload, selectinload, aliased
+from typing import List, Optional
 import math
 
 from database import get_db
 from models.post import Post
-from models.category import Category
-from schemas.post import Post as PostSchema, PostList
+from models.tag import Tag, PostTag
+from models.related_post import RelatedPost
+from schemas.post import Post as PostSchema, PostSummary, PostList
+from services.post_search import apply_post_search, render_snippet, use_search_index
+from services.search_index import post_index, make_snippet
+from services.post_views import post_views
+from services.response_cache import response_cache
+from services.post_counts import post_counts
+from services.category_registry import category_registry
+from utils.pagination import encode_cursor, decode_cursor, keyset_before
+from utils.text import tag_slug
 
 router = APIRouter()
 
 @router.get("/posts", response_model=PostList)
 async def get_posts(
+    request: Request,
     page: int = 1,
     limit: int = 10,
     category_id: Optional[int] = None,
     category: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    query = db.query(Post).filter(Post.is_published == True)
+    """
+    Published posts, newest first (or best match first when searching).
+    Pass the returned next_cursor instead of page for keyset pagination
+    (not available for search results, which are ranked).
+    ?tag= takes a tag name or slug, as listed by /api/tags.
+    Served from the response cache until an admin write invalidates it;
+    If-None-Match with the current ETag returns 304.
+    """
+    search = search.strip() if search else None
+    tag = tag.strip() if tag else None
+    cache_key = ("posts", page, limit, category_id, category, search, cursor, tag)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return response_cache.respond(request, cached)
+    
+    generation = response_cache.generation
+    result = query_posts(db, page, limit, category_id, category, search, cursor, tag)
+    return response_cache.respond(request, response_cache.store(cache_key, result, PostList, generation))
+
+def query_posts(
+    db: Session,
+    page: int,
+    limit: int,
+    category_id: Optional[int],
+    category: Optional[str],
+    search: Optional[str],
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None
+) -> PostList:
+    # Categories for the whole page in one extra SELECT, not one per post
+    query = db.query(Post).options(selectinload(Post.category)).filter(Post.is_published == True)
     
     if category_id:
         query = query.filter(Post.category_id == category_id)
     elif category:
-        # Filter by category slug/name - handle both slug and name matching
-        category_obj = db.query(Category).filter(
-            (Category.name.ilike(f"%{category}%")) |
-            (Category.slug == category.lower()) |
-            (Category.slug == category) |
-            (Category.name == category.title())
-        ).first()
+        # Filter by category slug/name (in-memory registry lookup)
+        category_obj = category_registry.resolve(db, category)
         if category_obj:
-            query = query.filter(Post.category_id == category_obj.id)
+            category_id = category_obj.id
+            query = query.filter(Post.category_id == category_id)
+    
+    tag_obj = None
+    if tag:
+        # Tag pages go through the post_tags index, not a LIKE over posts.tags
+        tag_obj = db.query(Tag).filter(Tag.slug == tag_slug(tag)).first()
+        if tag_obj is None:
+            return PostList(posts=[], total=0, page=page, limit=limit, total_pages=0)
+        tagged_ids = select(PostTag.post_id).where(PostTag.tag_id == tag_obj.id)
+        query = query.filter(Post.id.in_(tagged_ids))
+    
+    # Listings return PostSummary: never load the HTML content column
+    query = query.options(defer(Post.content, raiseload=True))
+    
+    if search and use_search_index():
+        # In-process BM25 index: ranked ids and snippets without reading post bodies
+        ranked_ids = post_index.search(search, category_id=category_id)
+        if tag_obj is not None:
+            tagged = set(db.execute(tagged_ids).scalars())
+            ranked_ids = [post_id for post_id in ranked_ids if post_id in tagged]
+        total = len(ranked_ids)
+        page_ids = ranked_ids[(page - 1) * limit:page * limit]
+        by_id = {post.id: post for post in query.filter(Post.id.in_(page_ids)).all()} if page_ids else {}
+        posts = [
+            PostSummary.model_validate(by_id[post_id]).model_copy(update={
+                "snippet": make_snippet(post_index.snippet_source(post_id) or "", search)
+            })
+            for post_id in page_ids if post_id in by_id
+        ]
+        return PostList(
+            posts=posts,
+            total=total,
+            page=page,
+            limit=limit,
+            total_pages=math.ceil(total / limit)
+        )
     
     if search:
-        query = query.filter(
-            Post.title.contains(search) | 
-            Post.content.contains(search) |
-            Post.excerpt.contains(search)
+        # Ranked full-text match (FTS5), or a LIKE filter where FTS is unavailable
+        query, snippet_column = apply_post_search(query, search)
+        total = query.count()
+        
+        query = query.order_by(desc(Post.created_at)).offset((page - 1) * limit).limit(limit)
+        if snippet_column is not None:
+            posts = [
+                PostSummary.model_validate(post).model_copy(update={"snippet": render_snippet(snippet)})
+                for post, snippet in query.add_columns(snippet_column).all()
+            ]
+        else:
+            posts = query.all()
+        
+        return PostList(
+            posts=posts,
+            total=total,
+            page=page,
+            limit=limit,
+            total_pages=math.ceil(total / limit)
         )
     
-    total = query.count()
+    # Maintained per-category and per-tag totals instead of COUNT(*) per request
+    if tag_obj is None:
+        total = post_counts.total(db, category_id=category_id or None, published=True)
+    elif not category_id:
+        total = tag_obj.post_count
+    else:
+        total = query.count()
+    
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(keyset_before(Post.created_at, Post.id, position))
     
-    posts = query.order_by(desc(Post.created_at)).offset((page - 1) * limit).limit(limit).all()
+    query = query.order_by(desc(Post.created_at), desc(Post.id))
+    if not cursor:
+        query = query.offset((page - 1) * limit)
+    
+    posts = query.limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
     
     return PostList(
         posts=posts,
         total=total,
         page=page,
         limit=limit,
-        total_pages=math.ceil(total / limit)
+        total_pages=math.ceil(total / limit),
+        next_cursor=next_cursor
     )
 
 @router.get("/posts/{slug}", response_model=PostSchema)
-async def get_post(slug: str, db: Session = Depends(get_db)):
-    post = db.query(Post).filter(
+async def get_post(slug: str, request: Request, db: Session = Depends(get_db)):
+    cache_key = ("post", slug)
+    cached = response_cache.get(cache_key)
+    if cached:
+        # Still a view, even when served from cache or revalidated
+        post_views.record(cached.meta)
+        return response_cache.respond(request, cached)
+    
+    generation = response_cache.generation
+    post = db.query(Post).options(joinedload(Post.category)).filter(
         and_(Post.slug == slug, Post.is_published == True)
     ).first()
     
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    # Increment view count
-    post.view_count += 1
-    db.commit()
-    db.refresh(post)
+    # Count the view in memory; it is written to posts.view_count in batches
+    post_views.record(post.id)
     
-    return post
\ No newline at end of file
+    result = PostSchema.model_validate(post).model_copy(update={
+        "view_count": (post.view_count or 0) + post_views.pending(post.id)
+    })
+    return response_cache.respond(
+        request, response_cache.store(cache_key, result, PostSchema, generation, meta=post.id)
+    )
+
+@router.get("/posts/{slug}/related", response_model=List[PostSummary])
+async def get_related_posts(slug: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Related published posts, most similar first, from the related_posts
+    table (precomputed by services/related_posts.py); empty when the post
+    doesn't exist or has no close matches.
+    """
+    cache_key = ("related", slug)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return response_cache.respond(request, cached)
+    
+    generation = response_cache.generation
+    source = aliased(Post)
+    posts = db.query(Post).options(
+        defer(Post.content, raiseload=True), selectinload(Post.category)
+    ).join(
+        RelatedPost, RelatedPost.related_id == Post.id
+    ).join(
+        source, source.id == RelatedPost.post_id
+    ).filter(
+        source.slug == slug, source.is_published == True, Post.is_published == True
+    ).order_by(RelatedPost.rank).all()
+    return response_cache.respond(
+        request, response_cache.store(cache_key, posts, List[PostSummary], generation)
+    )
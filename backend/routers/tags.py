@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+from sqlalchemy import desc
+from typing import List
+
+from database import get_db
+from models.tag import Tag
+from schemas.tag import Tag as TagSchema
+from services.response_cache import response_cache
+
+router = APIRouter()
+
+@router.get("/tags", response_model=List[TagSchema])
+async def get_tags(request: Request, limit: int = 100, db: Session = Depends(get_db)):
+    """
+    Tags of published posts with their post counts, most used first.
+    Counts come from tags.post_count, maintained on post writes.
+    """
+    cache_key = ("tags", limit)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return response_cache.respond(request, cached)
+    
+    generation = response_cache.generation
+    tags = db.query(Tag).filter(Tag.post_count > 0).order_by(
+        desc(Tag.post_count), Tag.name
+    ).limit(limit).all()
+    return response_cache.respond(
+        request, response_cache.store(cache_key, tags, List[TagSchema], generation)
+    )
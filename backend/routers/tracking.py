@@ -1,21 +1,43 @@
-from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, text, distinct
-from typing import List
+from typing import List, Optional
 import asyncio
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import pytz
 
 from database import get_db
-from models.visit import Visit
-from schemas.visit import VisitCreate, VisitResponse, AnalyticsStats, CountryStats, RecentVisit
-from utils.geolocation import get_country_from_ip, mask_ip_address
+from auth import get_current_admin
+from models.admin import Admin
+from models.visit import Visit, VisitDailyCountry, VisitDailyPage, VisitHourly, VisitSketch, get_kst_now
+from schemas.visit import (
+    VisitCreate, VisitResponse, AnalyticsStats, CountryStats, RecentVisit, RecentVisitPage,
+    PageStats, TimeseriesPoint, Timeseries
+)
+from services.visit_ingest import visit_ingest
+from services.visit_dedup import visit_dedup
+from services.visit_live import visit_live
+from services.post_views import post_views
+from services.visit_export import EXPORT_DATASETS, iter_dataset, encode_csv, encode_ndjson, gzip_chunks
+from services.visit_archive import list_archived_months, summarize_archived_month, MONTH_PATTERN
+from services.visit_sketches import total_unique_visitors, sketch_estimate, sketch_estimates, week_key
+from utils.geolocation import get_country_from_ip, mask_ip_address, geolocation_stats
+from utils.bot_filter import bot_filter
+from utils.time_ranges import kst_today
+from utils.pagination import encode_cursor, decode_cursor, keyset_before, clamp_limit
 
 router = APIRouter()
 
 # Korea Standard Time
 KST = pytz.timezone('Asia/Seoul')
 
+# Largest page /admin/analytics/recent will return
+RECENT_VISITS_MAX_LIMIT = 200
+
+# Longest range (in days) /admin/analytics/timeseries serves per granularity
+TIMESERIES_MAX_DAYS = {"hour": 62, "day": 731, "week": 3650}
+
 def get_client_ip(request: Request) -> str:
     """Extract client IP from request headers"""
     # Check for forwarded headers (for reverse proxies like Nginx)
@@ -38,33 +60,52 @@ def get_client_ip(request: Request) -> str:
 @router.post("/track")
 async def track_visit(
     visit_data: VisitCreate,
-    request: Request,
-    db: Session = Depends(get_db)
+    request: Request
 ):
     """
-    Public endpoint to track page visits
+    Public endpoint to track page visits.
+    Rows are buffered and written in batches by the visit ingest queue.
+    Crawler and bot traffic is counted and dropped before geolocation, and
+    repeat hits on the same page from the same IP within the dedup window
+    are counted but not stored.
     """
     try:
         # Extract visitor information
-        ip_address = get_client_ip(request)
         user_agent = request.headers.get("user-agent", "")[:500]  # Limit length
+        if bot_filter.check(user_agent):
+            return {"status": "success"}
+        
+        ip_address = get_client_ip(request)
+        if visit_dedup.is_duplicate(ip_address, visit_data.page_path):
+            return {"status": "success"}
+        
         ip_masked = mask_ip_address(ip_address)
         
         # Get geolocation data asynchronously
         geo_data = await get_country_from_ip(ip_address)
         
-        # Create visit record
-        visit = Visit(
-            ip_address=ip_address,
-            ip_masked=ip_masked,
-            page_path=visit_data.page_path,
-            country_code=geo_data.get("country_code"),
-            country_name=geo_data.get("country_name"),
-            user_agent=user_agent
-        )
+        # Queue visit record (timestamped now, not at flush time)
+        created_at = get_kst_now()
+        queued = visit_ingest.submit({
+            "ip_address": ip_address,
+            "ip_masked": ip_masked,
+            "page_path": visit_data.page_path,
+            "country_code": geo_data.get("country_code"),
+            "country_name": geo_data.get("country_name"),
+            "user_agent": user_agent,
+            "created_at": created_at
+        })
         
-        db.add(visit)
-        db.commit()
+        # Feed the live dashboard stream (masked IP only)
+        if queued:
+            visit_live.publish(ip_address, {
+                "ip_masked": ip_masked,
+                "page_path": visit_data.page_path,
+                "country_code": geo_data.get("country_code"),
+                "country_name": geo_data.get("country_name"),
+                "user_agent": user_agent,
+                "created_at": created_at
+            })
         
         return {"status": "success"}
         
@@ -76,30 +117,27 @@ async def track_visit(
 @router.get("/admin/analytics/stats", response_model=AnalyticsStats)
 async def get_analytics_stats(db: Session = Depends(get_db)):
     """
-    Get overall analytics statistics
+    Get overall analytics statistics.
+    Today's count is exact (daily rollup); week, month and all-time counts
+    are HyperLogLog estimates from the maintained sketches.
     """
     try:
         # Total visitors (unique IP addresses)
-        total_visitors = db.query(func.count(distinct(Visit.ip_address))).scalar() or 0
+        total_visitors = total_unique_visitors(db)
         
         # Today's visitors (unique IPs today) - in KST
-        now_kst = datetime.now(KST)
-        today_kst = now_kst.date()
-        visitors_today = db.query(func.count(distinct(Visit.ip_address))).filter(
-            func.date(Visit.created_at) == today_kst
+        today_kst = kst_today()
+        visitors_today = db.query(
+            func.sum(VisitDailyCountry.unique_visitors)
+        ).filter(
+            VisitDailyCountry.day == today_kst
         ).scalar() or 0
         
         # This week's visitors (unique IPs this week) - in KST
-        week_start_kst = today_kst - timedelta(days=today_kst.weekday())
-        visitors_this_week = db.query(func.count(distinct(Visit.ip_address))).filter(
-            func.date(Visit.created_at) >= week_start_kst
-        ).scalar() or 0
+        visitors_this_week = sketch_estimate(db, "week", week_key(today_kst))
         
         # This month's visitors (unique IPs this month) - in KST
-        month_start_kst = today_kst.replace(day=1)
-        visitors_this_month = db.query(func.count(distinct(Visit.ip_address))).filter(
-            func.date(Visit.created_at) >= month_start_kst
-        ).scalar() or 0
+        visitors_this_month = sketch_estimate(db, "month", today_kst.strftime("%Y-%m"))
         
         return AnalyticsStats(
             total_visitors=total_visitors,
@@ -120,26 +158,27 @@ async def get_analytics_stats(db: Session = Depends(get_db)):
 @router.get("/admin/analytics/countries", response_model=List[CountryStats])
 async def get_country_stats(db: Session = Depends(get_db)):
     """
-    Get visitor statistics by country
+    Get visitor statistics by country (HyperLogLog estimates per country)
     """
     try:
-        result = db.query(
-            Visit.country_code,
-            Visit.country_name,
-            func.count(distinct(Visit.ip_address)).label('visitor_count')
-        ).filter(
-            Visit.country_code.isnot(None)
-        ).group_by(
-            Visit.country_code, Visit.country_name
+        result = db.query(VisitSketch.key, VisitSketch.estimate).filter(
+            VisitSketch.scope == "country"
         ).order_by(
-            func.count(distinct(Visit.ip_address)).desc()
+            VisitSketch.estimate.desc()
         ).limit(20).all()
         
+        # Latest known display name per country
+        names = dict(
+            db.query(VisitDailyCountry.country_code, func.max(VisitDailyCountry.country_name)).filter(
+                VisitDailyCountry.country_code.in_([row.key for row in result])
+            ).group_by(VisitDailyCountry.country_code).all()
+        )
+        
         return [
             CountryStats(
-                country_code=row.country_code,
-                country_name=row.country_name,
-                visitor_count=row.visitor_count
+                country_code=row.key,
+                country_name=names.get(row.key),
+                visitor_count=row.estimate
             )
             for row in result
         ]
@@ -148,30 +187,261 @@ async def get_country_stats(db: Session = Depends(get_db)):
         print(f"Country stats error: {e}")
         return []
 
-@router.get("/admin/analytics/recent", response_model=List[RecentVisit])
+@router.get("/admin/analytics/recent", response_model=RecentVisitPage)
 async def get_recent_visits(
     limit: int = 50,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Get recent visits
+    Get recent visits, newest first.
+    Paginated by keyset on (created_at, id): pass the returned next_cursor
+    to fetch the following page. Page size is capped at RECENT_VISITS_MAX_LIMIT.
     """
+    limit = clamp_limit(limit, RECENT_VISITS_MAX_LIMIT)
+    
+    query = db.query(
+        Visit.id,
+        Visit.ip_masked,
+        Visit.page_path,
+        Visit.country_code,
+        Visit.country_name,
+        Visit.created_at
+    )
+    
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(keyset_before(Visit.created_at, Visit.id, position))
+    
     try:
-        visits = db.query(Visit).order_by(
-            Visit.created_at.desc()
-        ).limit(limit).all()
-        
-        return [
-            RecentVisit(
-                ip_masked=visit.ip_masked,
-                page_path=visit.page_path,
-                country_code=visit.country_code,
-                country_name=visit.country_name,
-                created_at=visit.created_at
-            )
-            for visit in visits
-        ]
-        
+        rows = query.order_by(
+            Visit.created_at.desc(), Visit.id.desc()
+        ).limit(limit + 1).all()
     except Exception as e:
         print(f"Recent visits error: {e}")
-        return []
\ No newline at end of file
+        return RecentVisitPage(visits=[])
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return RecentVisitPage(
+        visits=[RecentVisit.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
+
+@router.get("/admin/analytics/live")
+async def stream_live_visits(
+    request: Request,
+    current_admin: Admin = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-sent event stream of live visits and the number of visitors
+    active in the last 5 minutes. Served from memory (no DB queries);
+    reconnecting clients resume from the Last-Event-ID header.
+    Read by the admin analytics page (frontend/src/hooks/useLiveVisits.ts)
+    with fetch, since EventSource cannot send the Authorization header.
+    """
+    # The session (shared with get_current_admin) is only needed for the auth
+    # check; release its connection instead of holding it while the stream is open
+    db.close()
+    
+    last_event_id = request.headers.get("last-event-id", "")
+    last_seq = int(last_event_id) if last_event_id.isdigit() else 0
+
+    return StreamingResponse(
+        visit_live.stream(request, last_seq),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def resolve_day_range(start: Optional[date], end: Optional[date], default_days: int = 30):
+    """KST day range from optional from/to query values (defaults to the last N days)"""
+    end = end or kst_today()
+    start = start or end - timedelta(days=default_days - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    return start, end
+
+@router.get("/admin/analytics/pages", response_model=List[PageStats])
+async def get_page_stats(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    limit: int = 20,
+    current_admin: Admin = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Top pages by visits for a KST date range (from the daily page rollup)
+    """
+    start, end = resolve_day_range(start, end)
+    visits = func.sum(VisitDailyPage.visits)
+    result = db.query(
+        VisitDailyPage.page_path,
+        visits.label("visits")
+    ).filter(
+        VisitDailyPage.day >= start,
+        VisitDailyPage.day <= end
+    ).group_by(
+        VisitDailyPage.page_path
+    ).order_by(
+        visits.desc()
+    ).limit(clamp_limit(limit, 100)).all()
+    
+    return [PageStats(page_path=row.page_path, visits=row.visits) for row in result]
+
+@router.get("/admin/analytics/timeseries", response_model=Timeseries)
+async def get_timeseries(
+    granularity: str = "day",
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    current_admin: Admin = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Visits per hour, day or week for a KST date range, read from the
+    hourly/daily rollups. Day and week buckets also carry unique visitors
+    (exact per day, HyperLogLog estimate per week). Empty buckets are
+    returned as zero.
+    """
+    if granularity not in TIMESERIES_MAX_DAYS:
+        raise HTTPException(status_code=400, detail="granularity must be hour, day or week")
+    start, end = resolve_day_range(start, end, default_days=2 if granularity == "hour" else 30)
+    if granularity == "week":
+        # Align to whole Monday-Sunday weeks
+        start = start - timedelta(days=start.weekday())
+        end = end + timedelta(days=6 - end.weekday())
+    if (end - start).days + 1 > TIMESERIES_MAX_DAYS[granularity]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too long for {granularity} granularity (max {TIMESERIES_MAX_DAYS[granularity]} days)"
+        )
+    
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    points = []
+    
+    if granularity == "hour":
+        counts = {
+            (row.day, row.hour): row.visits
+            for row in db.query(VisitHourly).filter(VisitHourly.day >= start, VisitHourly.day <= end)
+        }
+        for day in days:
+            for hour in range(24):
+                points.append(TimeseriesPoint(
+                    bucket=f"{day.isoformat()}T{hour:02d}:00",
+                    visits=counts.get((day, hour), 0)
+                ))
+    else:
+        daily = {
+            row.day: row
+            for row in db.query(
+                VisitDailyCountry.day,
+                func.sum(VisitDailyCountry.visits).label("visits"),
+                func.sum(VisitDailyCountry.unique_visitors).label("unique_visitors")
+            ).filter(
+                VisitDailyCountry.day >= start, VisitDailyCountry.day <= end
+            ).group_by(VisitDailyCountry.day)
+        }
+        if granularity == "day":
+            for day in days:
+                row = daily.get(day)
+                points.append(TimeseriesPoint(
+                    bucket=day.isoformat(),
+                    visits=row.visits if row else 0,
+                    unique_visitors=row.unique_visitors if row else 0
+                ))
+        else:
+            mondays = days[::7]
+            weekly_uniques = sketch_estimates(db, "week", [monday.isoformat() for monday in mondays])
+            for monday in mondays:
+                week_days = [monday + timedelta(days=i) for i in range(7)]
+                points.append(TimeseriesPoint(
+                    bucket=monday.isoformat(),
+                    visits=sum(daily[day].visits for day in week_days if day in daily),
+                    unique_visitors=weekly_uniques.get(monday.isoformat(), 0)
+                ))
+    
+    return Timeseries(granularity=granularity, start=start, end=end, points=points)
+
+@router.get("/admin/analytics/pipeline")
+async def get_pipeline_stats(current_admin: Admin = Depends(get_current_admin)):
+    """
+    Get tracking pipeline metrics (bot filtering, duplicate suppression,
+    ingest queue depth, flush latency, geolocation cache hit rate,
+    pending post view counts)
+    """
+    return {
+        "bot_filter": bot_filter.stats(),
+        "dedup": visit_dedup.stats(),
+        "live": visit_live.stats(),
+        "ingest": visit_ingest.stats(),
+        "geolocation": geolocation_stats(),
+        "post_views": post_views.stats()
+    }
+
+@router.get("/admin/analytics/archive")
+async def get_archived_months(current_admin: Admin = Depends(get_current_admin)):
+    """
+    List months whose raw visits have been moved to the archive
+    """
+    return {"months": list_archived_months()}
+
+@router.get("/admin/analytics/archive/{month}")
+def get_archived_month_report(
+    month: str,
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Historical report for an archived month (YYYY-MM), read from its archive file
+    """
+    if not MONTH_PATTERN.match(month):
+        raise HTTPException(status_code=400, detail="Month must be in YYYY-MM format")
+    
+    report = summarize_archived_month(month)
+    if report is None:
+        raise HTTPException(status_code=404, detail="No archive for this month")
+    
+    return report
+
+@router.get("/admin/analytics/export")
+def export_analytics(
+    dataset: str = "visits",
+    format: str = "csv",
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    gzip: bool = False,
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Stream visits or daily rollups for a KST date range as CSV or NDJSON.
+    dataset: visits | daily_countries | daily_pages
+    Defaults to the last 30 days; rows are fetched in batches so memory
+    use does not grow with the size of the export.
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=400, detail=f"dataset must be one of: {', '.join(EXPORT_DATASETS)}")
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    
+    start, end = resolve_day_range(start, end)
+    
+    columns = EXPORT_DATASETS[dataset]
+    rows = iter_dataset(dataset, start, end)
+    body = encode_csv(rows, columns) if format == "csv" else encode_ndjson(rows, columns)
+    
+    filename = f"{dataset}-{start.isoformat()}_{end.isoformat()}.{format}"
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    if gzip:
+        body = gzip_chunks(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -99,13 +99,38 @@ class Post(PostBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     category: Optional[Category] = None
+    snippet: Optional[str] = None  # Highlighted search match (search results only)
+
+    class Config:
+        from_attributes = True
+
+class PostSummary(BaseModel):
+    """Listing card fields: everything except the HTML content"""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    category_id: Optional[int] = None
+    tags: Optional[str] = None
+    is_published: bool = False
+    external_url: Optional[str] = None
+    source: Optional[str] = None
+    client_name: Optional[str] = None
+    training_date: Optional[str] = None
+    view_count: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    category: Optional[Category] = None
+    snippet: Optional[str] = None  # Highlighted search match (search results only)
 
     class Config:
         from_attributes = True
 
 class PostList(BaseModel):
-    posts: List[Post]
+    posts: List[PostSummary]
     total: int
     page: int
     limit: int
-    total_pages: int
\ No newline at end of file
+    total_pages: int
+    next_cursor: Optional[str] = None  # Keyset cursor for the following page
\ No newline at end of file
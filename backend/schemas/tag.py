@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+class Tag(BaseModel):
+    id: int
+    name: str
+    slug: str
+    post_count: int
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 class VisitCreate(BaseModel):
     page_path: str
@@ -28,6 +28,7 @@ class CountryStats(BaseModel):
     visitor_count: int
 
 class RecentVisit(BaseModel):
+    id: int
     ip_masked: Optional[str]
     page_path: str
     country_code: Optional[str]
@@ -35,4 +36,23 @@ class RecentVisit(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class RecentVisitPage(BaseModel):
+    visits: List[RecentVisit]
+    next_cursor: Optional[str] = None
+
+class PageStats(BaseModel):
+    page_path: str
+    visits: int
+
+class TimeseriesPoint(BaseModel):
+    bucket: str  # hour: 2024-01-31T13:00, day: 2024-01-31, week: Monday of the week
+    visits: int
+    unique_visitors: Optional[int] = None
+
+class Timeseries(BaseModel):
+    granularity: str
+    start: date
+    end: date
+    points: List[TimeseriesPoint]
@@ -0,0 +1,77 @@
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from models.category import Category
+from schemas.category import Category as CategorySchema
+
+class CategoryRegistry:
+    """
+    In-memory copy of the categories table, indexed for the lookups the
+    public routers make: by id, and by slug, lowercase name or alias for
+    the ?category= filter. Loaded on first use and reloaded after admin
+    category writes, so category resolution and /api/categories need no
+    database access.
+    """
+
+    def __init__(self):
+        self._categories: Optional[List[CategorySchema]] = None
+        self._by_id: Dict[int, CategorySchema] = {}
+        self._by_key: Dict[str, CategorySchema] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.loads = 0
+
+    @staticmethod
+    def _keys(category: CategorySchema) -> List[str]:
+        """Lookup keys: slug and name, lowercased, with '-' and ' ' interchangeable"""
+        keys = []
+        for value in (category.slug, category.name):
+            value = value.strip().lower()
+            keys.extend([value, value.replace("-", " "), value.replace(" ", "-")])
+        return keys
+
+    def refresh(self, db: Session):
+        """Reload all categories from the database"""
+        categories = [CategorySchema.model_validate(row) for row in db.query(Category).order_by(Category.id).all()]
+        by_id = {category.id: category for category in categories}
+        by_key: Dict[str, CategorySchema] = {}
+        for category in categories:
+            for key in self._keys(category):
+                by_key.setdefault(key, category)
+
+        with self._lock:
+            self._categories = categories
+            self._by_id = by_id
+            self._by_key = by_key
+            self.loads += 1
+
+    def _ensure(self, db: Session):
+        if self._categories is None:
+            self.refresh(db)
+
+    def all(self, db: Session) -> List[CategorySchema]:
+        self._ensure(db)
+        return self._categories
+
+    def get(self, db: Session, category_id: int) -> Optional[CategorySchema]:
+        self._ensure(db)
+        return self._by_id.get(category_id)
+
+    def resolve(self, db: Session, value: str) -> Optional[CategorySchema]:
+        """
+        Category for a ?category= value: an exact slug, name or alias match,
+        else the first category whose name contains the value (as the
+        previous ilike('%value%') lookup did)
+        """
+        self._ensure(db)
+        key = value.strip().lower()
+        category = self._by_key.get(key)
+        if category is None and key:
+            category = next((c for c in self._categories if key in c.name.lower()), None)
+        return category
+
+# Global category registry instance
+category_registry = CategoryRegistry()
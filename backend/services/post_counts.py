@@ -0,0 +1,55 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.post import Post
+
+class PostCountCache:
+    """
+    Post totals per (category_id, is_published), loaded with one GROUP BY
+    and kept until an admin post write marks them stale. Listing endpoints
+    read their totals from here instead of running COUNT(*) per request.
+
+    Totals read while an invalidation happens are returned but not kept:
+    the generation is taken before the query and checked before storing.
+    """
+
+    def __init__(self):
+        self._counts: Optional[Dict[Tuple[Optional[int], bool], int]] = None
+        self._lock = threading.Lock()
+        self.generation = 0
+
+        # Metrics
+        self.loads = 0
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._counts = None
+
+    def _load(self, db: Session) -> Dict[Tuple[Optional[int], bool], int]:
+        counts = self._counts
+        if counts is None:
+            generation = self.generation
+            rows = db.query(Post.category_id, Post.is_published, func.count(Post.id)).group_by(
+                Post.category_id, Post.is_published
+            ).all()
+            counts = {(category_id, bool(published)): total for category_id, published, total in rows}
+            with self._lock:
+                if generation == self.generation:
+                    self._counts = counts
+                self.loads += 1
+        return counts
+
+    def total(self, db: Session, category_id: Optional[int] = None, published: Optional[bool] = None) -> int:
+        """Number of posts, optionally restricted to a category and/or publish state"""
+        return sum(
+            count for (row_category, row_published), count in self._load(db).items()
+            if (category_id is None or row_category == category_id)
+            and (published is None or row_published == published)
+        )
+
+# Global post count cache instance
+post_counts = PostCountCache()
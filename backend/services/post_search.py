@@ -0,0 +1,190 @@
+import os
+import re
+import html
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy import Float, Integer, String, event, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Query
+
+from models.post import Post
+from services.search_index import post_index
+from utils.text import html_to_text, parse_tags
+
+logger = logging.getLogger(__name__)
+
+POSTS_FTS_TABLE = "posts_fts"
+
+# Columns of the FTS table (rowid = posts.id) and their bm25 weights
+FTS_COLUMNS = ("title", "excerpt", "body", "tags")
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 6.0)
+INDEXED_ATTRIBUTES = ("title", "excerpt", "content", "tags")
+
+# Snippet markers, swapped for <mark> after the snippet text is HTML-escaped
+_MARK_OPEN = "\x02"
+_MARK_CLOSE = "\x03"
+SNIPPET_TOKENS = 24
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# auto: FTS5 where available, otherwise the in-process index (services/search_index)
+# fts | index | like: force one backend (fts and index fall back to LIKE when unavailable)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+
+# Set once the FTS table is known to exist on the application database
+_fts_enabled = False
+
+def fts_enabled() -> bool:
+    return _fts_enabled
+
+def wants_search_index() -> bool:
+    """Whether the in-process index should be built for this deployment"""
+    return SEARCH_BACKEND == "index" or (SEARCH_BACKEND == "auto" and not _fts_enabled)
+
+def use_search_index() -> bool:
+    """Whether searches are currently answered by the in-process index"""
+    return wants_search_index() and post_index.ready
+
+def ensure_post_search_index(engine: Engine) -> bool:
+    """
+    Create the FTS5 table on SQLite if it is missing and populate it.
+    Returns False (search falls back to LIKE) on other backends or when
+    SQLite was built without FTS5.
+    """
+    global _fts_enabled
+    if engine.dialect.name != "sqlite":
+        _fts_enabled = False
+        return False
+
+    try:
+        with engine.begin() as connection:
+            exists = connection.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+            ), {"name": POSTS_FTS_TABLE}).first() is not None
+            if not exists:
+                connection.execute(text(
+                    f"CREATE VIRTUAL TABLE {POSTS_FTS_TABLE} USING fts5("
+                    f"{', '.join(FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')"
+                ))
+                indexed = rebuild_post_search_index(connection)
+                logger.info(f"Created {POSTS_FTS_TABLE} and indexed {indexed} posts")
+    except Exception as e:
+        logger.warning(f"FTS5 unavailable, post search will use LIKE: {e}")
+        _fts_enabled = False
+        return False
+
+    _fts_enabled = True
+    return True
+
+def _index_values(post) -> dict:
+    return {
+        "id": post.id,
+        "title": post.title or "",
+        "excerpt": post.excerpt or "",
+        "body": html_to_text(post.content),
+        "tags": " ".join(parse_tags(post.tags)),
+    }
+
+def index_post(connection: Connection, post):
+    """Replace a post's row in the FTS table"""
+    connection.execute(text(f"DELETE FROM {POSTS_FTS_TABLE} WHERE rowid = :id"), {"id": post.id})
+    connection.execute(text(
+        f"INSERT INTO {POSTS_FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) "
+        f"VALUES (:id, :title, :excerpt, :body, :tags)"
+    ), _index_values(post))
+
+def unindex_post(connection: Connection, post_id: int):
+    connection.execute(text(f"DELETE FROM {POSTS_FTS_TABLE} WHERE rowid = :id"), {"id": post_id})
+
+def rebuild_post_search_index(connection: Connection, batch_size: int = 500) -> int:
+    """Re-index every post from the posts table; returns the number indexed"""
+    connection.execute(text(f"DELETE FROM {POSTS_FTS_TABLE}"))
+    count = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(text(
+            "SELECT id, title, excerpt, content, tags FROM posts "
+            "WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            break
+        connection.execute(text(
+            f"INSERT INTO {POSTS_FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) "
+            f"VALUES (:id, :title, :excerpt, :body, :tags)"
+        ), [_index_values(row) for row in rows])
+        count += len(rows)
+        last_id = rows[-1].id
+    connection.execute(text(f"INSERT INTO {POSTS_FTS_TABLE} ({POSTS_FTS_TABLE}) VALUES ('optimize')"))
+    return count
+
+# Keep the index in step with ORM writes (admin create/update/delete).
+# Bulk query.update()/delete() and raw SQL bypass these; run
+# migrate_post_search.py afterwards to rebuild.
+
+@event.listens_for(Post, "after_insert")
+def _post_inserted(mapper, connection, target):
+    if _fts_enabled:
+        index_post(connection, target)
+
+@event.listens_for(Post, "after_update")
+def _post_updated(mapper, connection, target):
+    if not _fts_enabled:
+        return
+    # view_count bumps and other non-indexed changes don't touch the index
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in INDEXED_ATTRIBUTES):
+        index_post(connection, target)
+
+@event.listens_for(Post, "after_delete")
+def _post_deleted(mapper, connection, target):
+    if _fts_enabled:
+        unindex_post(connection, target.id)
+
+def build_match_query(search: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression for free-text input: every word must match,
+    as a prefix so Korean words still match with particles attached.
+    User input is reduced to word tokens, so FTS syntax can't be injected.
+    """
+    tokens = _TOKEN_PATTERN.findall(search.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens[:16])
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a raw FTS snippet and turn the match markers into <mark> tags"""
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+def apply_post_search(query: Query, search: str) -> Tuple[Query, Optional[object]]:
+    """
+    Restrict a Post query to posts matching `search`.
+
+    With FTS5 the query is joined to the ranked matches and ordered by
+    bm25 (best first); the returned column is the raw snippet, to be
+    added to the query and passed through render_snippet(). Without FTS
+    (or when the input has no word characters) it falls back to the LIKE
+    filter and returns None for the snippet.
+    """
+    use_fts = _fts_enabled and SEARCH_BACKEND in ("auto", "fts")
+    match = build_match_query(search) if use_fts else None
+    if match is None:
+        return query.filter(
+            Post.title.contains(search) |
+            Post.content.contains(search) |
+            Post.excerpt.contains(search)
+        ), None
+
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+    matches = text(
+        f"SELECT rowid AS post_id, bm25({POSTS_FTS_TABLE}, {weights}) AS rank, "
+        f"snippet({POSTS_FTS_TABLE}, -1, :mark_open, :mark_close, '…', {SNIPPET_TOKENS}) AS snippet "
+        f"FROM {POSTS_FTS_TABLE} WHERE {POSTS_FTS_TABLE} MATCH :match"
+    ).bindparams(
+        match=match, mark_open=_MARK_OPEN, mark_close=_MARK_CLOSE
+    ).columns(post_id=Integer, rank=Float, snippet=String).subquery("post_matches")
+
+    query = query.join(matches, matches.c.post_id == Post.id).order_by(matches.c.rank)
+    return query, matches.c.snippet
@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, func, inspect, select, delete, update, and_
+from sqlalchemy.engine import Connection
+
+from models.post import Post
+from models.tag import Tag, PostTag
+from utils.text import parse_tags, tag_slug
+
+TAGGED_ATTRIBUTES = ("tags", "is_published")
+
+def post_tag_slugs(tags: Optional[str]) -> Dict[str, str]:
+    """slug -> display name for a Post.tags value, first spelling wins"""
+    slugs: Dict[str, str] = {}
+    for name in parse_tags(tags):
+        slug = tag_slug(name)
+        if slug:
+            slugs.setdefault(slug, name[:100])
+    return slugs
+
+def _ensure_tags(connection: Connection, slugs: Dict[str, str]) -> Dict[str, int]:
+    """Tag ids for the given slugs, creating the missing tags"""
+    if not slugs:
+        return {}
+    existing = dict(connection.execute(select(Tag.slug, Tag.id).where(Tag.slug.in_(list(slugs)))).all())
+    missing = [{"slug": slug, "name": name, "post_count": 0} for slug, name in slugs.items() if slug not in existing]
+    if missing:
+        connection.execute(Tag.__table__.insert(), missing)
+        existing.update(connection.execute(
+            select(Tag.slug, Tag.id).where(Tag.slug.in_([row["slug"] for row in missing]))
+        ).all())
+    return existing
+
+def recount_tags(connection: Connection, tag_ids: Optional[Iterable[int]] = None):
+    """
+    Recompute tags.post_count (published posts only) for the given tags,
+    or for every tag. Each count is a range read of ix_post_tags_tag_id_post_id.
+    """
+    published = select(func.count()).select_from(PostTag).join(Post, Post.id == PostTag.post_id).where(
+        and_(PostTag.tag_id == Tag.id, Post.is_published == True)
+    ).scalar_subquery()
+    stmt = update(Tag).values(post_count=published)
+    if tag_ids is not None:
+        tag_ids = list(tag_ids)
+        if not tag_ids:
+            return
+        stmt = stmt.where(Tag.id.in_(tag_ids))
+    connection.execute(stmt)
+
+def sync_post_tags(connection: Connection, post_id: int, tags: Optional[str], previous: Optional[Set[int]] = None):
+    """
+    Replace a post's tag links with those parsed from `tags` and update the
+    affected counts. `previous` is the currently linked tag ids, if known.
+    """
+    if previous is None:
+        previous = set(connection.execute(
+            select(PostTag.tag_id).where(PostTag.post_id == post_id)
+        ).scalars())
+    current = set(_ensure_tags(connection, post_tag_slugs(tags)).values())
+
+    if previous - current:
+        connection.execute(delete(PostTag).where(
+            and_(PostTag.post_id == post_id, PostTag.tag_id.in_(previous - current))
+        ))
+    if current - previous:
+        connection.execute(PostTag.__table__.insert(), [
+            {"post_id": post_id, "tag_id": tag_id} for tag_id in current - previous
+        ])
+    recount_tags(connection, previous | current)
+
+def unlink_post_tags(connection: Connection, post_id: int):
+    previous = list(connection.execute(select(PostTag.tag_id).where(PostTag.post_id == post_id)).scalars())
+    if previous:
+        connection.execute(delete(PostTag).where(PostTag.post_id == post_id))
+        recount_tags(connection, previous)
+
+def rebuild_post_tags(connection: Connection, batch_size: int = 500) -> int:
+    """Re-derive post_tags from every post's tags column; returns the number of links"""
+    connection.execute(delete(PostTag))
+    links = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(Post.id, Post.tags).where(Post.id > last_id).order_by(Post.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        parsed = {row.id: post_tag_slugs(row.tags) for row in rows}
+        slugs: Dict[str, str] = {}
+        for post_slugs in parsed.values():
+            for slug, name in post_slugs.items():
+                slugs.setdefault(slug, name)
+        tag_ids = _ensure_tags(connection, slugs)
+        values: List[dict] = [
+            {"post_id": post_id, "tag_id": tag_ids[slug]}
+            for post_id, post_slugs in parsed.items() for slug in post_slugs
+        ]
+        if values:
+            connection.execute(PostTag.__table__.insert(), values)
+        links += len(values)
+        last_id = rows[-1].id
+    recount_tags(connection)
+    return links
+
+# Keep post_tags and the tag counts in step with ORM writes, in the same
+# transaction. Bulk query.update()/delete() and raw SQL bypass these; run
+# migrate_tags.py afterwards to rebuild.
+
+@event.listens_for(Post, "after_insert")
+def _post_inserted(mapper, connection, target):
+    if target.tags:
+        sync_post_tags(connection, target.id, target.tags, previous=set())
+
+@event.listens_for(Post, "after_update")
+def _post_updated(mapper, connection, target):
+    # Publishing or unpublishing changes the counts even if the tags didn't
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in TAGGED_ATTRIBUTES):
+        sync_post_tags(connection, target.id, target.tags)
+
+@event.listens_for(Post, "after_delete")
+def _post_deleted(mapper, connection, target):
+    unlink_post_tags(connection, target.id)
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import bindparam, update
+
+from database import SessionLocal
+from models.post import Post
+
+logger = logging.getLogger(__name__)
+
+class PostViewCounter:
+    """
+    Write-behind counter for post views.
+
+    GET /api/posts/{slug} only increments an in-memory count per post. A
+    background thread folds the counts into posts.view_count every
+    `flush_interval` seconds with one executemany of atomic
+    `view_count = view_count + n` updates, so concurrent readers never
+    lose increments and the read path does no writes. Counts that fail
+    to flush are kept for the next attempt.
+    """
+
+    def __init__(self):
+        self.flush_interval = float(os.getenv("VIEW_FLUSH_INTERVAL", "10.0"))
+
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        # Metrics
+        self.recorded = 0
+        self.written = 0
+        self.failed_flushes = 0
+        self.flush_count = 0
+        self.last_flush_posts = 0
+        self.last_flush_ms = 0.0
+
+    def record(self, post_id: int):
+        with self._lock:
+            self._counts[post_id] = self._counts.get(post_id, 0) + 1
+            self.recorded += 1
+
+    def pending(self, post_id: int) -> int:
+        """Views recorded for a post but not yet written"""
+        return self._counts.get(post_id, 0)
+
+    def start(self):
+        """Start the background flush thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="post-views", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and write out everything still pending"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 10)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.wait(timeout=self.flush_interval):
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all pending counts in one transaction; returns the number of posts updated"""
+        with self._flush_lock:
+            with self._lock:
+                counts, self._counts = self._counts, {}
+            if not counts:
+                return 0
+
+            started = time.perf_counter()
+            db = SessionLocal()
+            try:
+                stmt = update(Post.__table__).where(
+                    Post.__table__.c.id == bindparam("post_id")
+                ).values(view_count=Post.__table__.c.view_count + bindparam("views"))
+                db.execute(stmt, [
+                    {"post_id": post_id, "views": views} for post_id, views in counts.items()
+                ])
+                db.commit()
+                self.written += sum(counts.values())
+            except Exception as e:
+                db.rollback()
+                self.failed_flushes += 1
+                logger.error(f"Post view flush failed ({len(counts)} posts): {e}")
+                # Put the counts back so they are retried on the next flush
+                with self._lock:
+                    for post_id, views in counts.items():
+                        self._counts[post_id] = self._counts.get(post_id, 0) + views
+            finally:
+                db.close()
+
+            self.flush_count += 1
+            self.last_flush_posts = len(counts)
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            return len(counts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending_posts": len(self._counts),
+            "pending_views": sum(self._counts.values()),
+            "recorded": self.recorded,
+            "written": self.written,
+            "failed_flushes": self.failed_flushes,
+            "flush_count": self.flush_count,
+            "last_flush_posts": self.last_flush_posts,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+        }
+
+# Global post view counter instance
+post_views = PostViewCounter()
@@ -0,0 +1,290 @@
+import os
+import math
+import time
+import heapq
+import logging
+import threading
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, delete
+
+from database import SessionLocal
+from models.post import Post
+from models.related_post import RelatedPost
+from services.search_index import FIELD_WEIGHTS, document_fields, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Pairs scoring below this are not worth showing as related
+MIN_SCORE = 0.1
+
+Vector = Dict[str, float]
+Neighbours = List[Tuple[int, float]]
+
+class RelatedPosts:
+    """
+    Top-k most similar published posts for every published post, by cosine
+    similarity of TF-IDF vectors (field-weighted, as in the search index).
+
+    build() vectorizes the whole corpus and computes all neighbour lists in
+    one pass: the sparse product X·Xᵀ is accumulated through an inverted
+    index (term -> {post: weight}), so only pairs sharing a term are ever
+    scored. Each vector keeps its strongest terms only and terms found in
+    most posts are dropped, which bounds the posting lists walked.
+
+    refresh_post() / remove_post() then update a single post's vector and
+    rewrite the lists that can have changed: its own, those that already
+    include it, and those it now beats the k-th entry of. IDF weights stay
+    as of the last build until the next one.
+
+    Results are written to the related_posts table; the API reads them
+    from there. Refreshes write their lists while holding the lock and bump
+    a generation, so a full rebuild's table write can tell whether it was
+    overtaken (see rebuild_related_posts).
+    """
+
+    def __init__(self):
+        self.k = int(os.getenv("RELATED_POSTS_K", "5"))
+        self.max_terms = int(os.getenv("RELATED_MAX_TERMS", "64"))
+        self.max_df = float(os.getenv("RELATED_MAX_DF", "0.5"))
+        self._vectors: Dict[int, Vector] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._neighbours: Dict[int, Neighbours] = {}
+        self._df: Dict[str, int] = {}
+        self._documents = 0
+        self._lock = threading.RLock()
+        self._building = False
+        self._pending: List[Tuple[int, Optional[Dict[str, str]]]] = []
+        self._generation = 0
+        self.ready = False
+
+        # Metrics
+        self.build_seconds = 0.0
+        self.refreshes = 0
+        self.lists_written = 0
+
+    # Vectors
+
+    @staticmethod
+    def _term_counts(fields: Dict[str, str]) -> Dict[str, float]:
+        counts: Dict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS:
+            for token, n in Counter(tokenize(fields[field])).items():
+                if len(token) > 1:
+                    counts[token] += weight * n
+        return counts
+
+    def _idf(self, term: str) -> float:
+        df = self._df.get(term, 0)
+        if self._documents >= 10 and df > self.max_df * self._documents:
+            return 0.0
+        return math.log((self._documents + 1) / (df + 1)) + 1.0
+
+    def _vector(self, counts: Dict[str, float]) -> Vector:
+        """Sublinear tf * idf over the strongest terms, L2-normalized"""
+        weights = [(term, (1.0 + math.log(tf)) * self._idf(term)) for term, tf in counts.items()]
+        top = heapq.nlargest(self.max_terms, (item for item in weights if item[1] > 0), key=itemgetter(1))
+        norm = math.sqrt(sum(weight * weight for _, weight in top))
+        return {term: weight / norm for term, weight in top} if norm else {}
+
+    # Similarity
+
+    def _scores(self, post_id: int, vector: Vector) -> Dict[int, float]:
+        """Cosine similarity of `vector` with every post sharing a term"""
+        scores: Dict[int, float] = defaultdict(float)
+        for term, weight in vector.items():
+            for other, other_weight in self._postings.get(term, {}).items():
+                if other != post_id:
+                    scores[other] += weight * other_weight
+        return scores
+
+    def _top(self, scores: Dict[int, float]) -> Neighbours:
+        top = heapq.nlargest(self.k, scores.items(), key=itemgetter(1))
+        return [(post_id, round(score, 6)) for post_id, score in top if score >= MIN_SCORE]
+
+    def _add(self, post_id: int, vector: Vector):
+        self._vectors[post_id] = vector
+        for term, weight in vector.items():
+            self._postings.setdefault(term, {})[post_id] = weight
+
+    def _remove(self, post_id: int):
+        for term in self._vectors.pop(post_id, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(post_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    # Build and refresh
+
+    def build(self, rows: Iterable[Any]) -> Tuple[Dict[int, Neighbours], int]:
+        """
+        Replace the model with `rows` (published posts) and return every
+        post's neighbour list, with the generation they are current as of.
+        The corpus is scored on a scratch model without holding the lock;
+        refreshes that arrive meanwhile are queued and replayed onto it
+        before it is swapped in, so their lists are included.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._building = True
+            self._pending = []
+        try:
+            counts = {row.id: self._term_counts(document_fields(row)) for row in rows}
+            df: Dict[str, int] = defaultdict(int)
+            for terms in counts.values():
+                for term in terms:
+                    df[term] += 1
+
+            model = RelatedPosts()
+            model.k, model.max_terms, model.max_df = self.k, self.max_terms, self.max_df
+            model._documents = len(counts)
+            model._df = dict(df)
+            for post_id, terms in counts.items():
+                model._add(post_id, model._vector(terms))
+            model._neighbours = {
+                post_id: model._top(model._scores(post_id, vector)) for post_id, vector in model._vectors.items()
+            }
+        except Exception:
+            with self._lock:
+                self._building = False
+            raise
+
+        with self._lock:
+            self._documents, self._df = model._documents, model._df
+            self._vectors, self._postings, self._neighbours = model._vectors, model._postings, model._neighbours
+            pending, self._pending = self._pending, []
+            self._building = False
+            self.ready = True
+            for post_id, fields in pending:
+                self._update(post_id, fields)
+            neighbours = dict(self._neighbours)
+            generation = self._generation
+
+        self.build_seconds = time.perf_counter() - started
+        logger.info(f"Related posts built: {len(neighbours)} posts, {len(self._postings)} terms "
+                    f"in {self.build_seconds:.1f}s")
+        return neighbours, generation
+
+    def _update(self, post_id: int, fields: Optional[Dict[str, str]]) -> Dict[int, Neighbours]:
+        """Apply one post's new text (None: unpublished/deleted); returns the changed lists"""
+        vector = self._vector(self._term_counts(fields)) if fields is not None else None
+        if vector == self._vectors.get(post_id):
+            return {}
+
+        affected: Set[int] = {
+            other for other, neighbours in self._neighbours.items()
+            if any(related_id == post_id for related_id, _ in neighbours)
+        }
+        self._remove(post_id)
+        self._neighbours.pop(post_id, None)
+        if vector is not None:
+            self._add(post_id, vector)
+            scores = self._scores(post_id, vector)
+            self._neighbours[post_id] = self._top(scores)
+            for other, score in scores.items():
+                neighbours = self._neighbours.get(other, [])
+                if score >= MIN_SCORE and (len(neighbours) < self.k or score > neighbours[-1][1]):
+                    affected.add(other)
+
+        affected.discard(post_id)
+        for other in affected:
+            self._neighbours[other] = self._top(self._scores(other, self._vectors.get(other, {})))
+        changed = {other: self._neighbours[other] for other in affected}
+        changed[post_id] = self._neighbours.get(post_id, [])
+        return changed
+
+    def _apply(self, post_id: int, fields: Optional[Dict[str, str]]):
+        with self._lock:
+            if self._building:
+                self._pending.append((post_id, fields))
+            if not self.ready:
+                return
+            changed = self._update(post_id, fields)
+            if changed:
+                self._generation += 1
+                self.refreshes += 1
+                store_related_posts(changed)
+
+    def store_if_changed(self, generation: int) -> bool:
+        """
+        Rewrite the whole table from the current lists if a refresh was
+        applied after `generation` (its rows may have been overwritten by a
+        full write of older lists). Returns True if it rewrote.
+        """
+        with self._lock:
+            if self._generation == generation:
+                return False
+            store_related_posts(dict(self._neighbours), replace_all=True)
+            return True
+
+    def refresh_post(self, post):
+        """Recompute after a post write; unpublished posts lose their lists"""
+        self._apply(post.id, document_fields(post) if post.is_published else None)
+
+    def remove_post(self, post_id: int):
+        self._apply(post_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "building": self._building,
+            "posts": len(self._vectors),
+            "terms": len(self._postings),
+            "build_seconds": round(self.build_seconds, 2),
+            "refreshes": self.refreshes,
+            "lists_written": self.lists_written,
+        }
+
+# Global related posts instance
+related_posts = RelatedPosts()
+
+def store_related_posts(neighbours: Dict[int, Neighbours], replace_all: bool = False):
+    """Write neighbour lists to related_posts, replacing those posts' rows (or the whole table)"""
+    db = SessionLocal()
+    try:
+        if replace_all:
+            db.execute(delete(RelatedPost))
+        else:
+            db.execute(delete(RelatedPost).where(RelatedPost.post_id.in_(list(neighbours))))
+        rows = [
+            {"post_id": post_id, "rank": rank, "related_id": related_id, "score": score}
+            for post_id, related in neighbours.items()
+            for rank, (related_id, score) in enumerate(related)
+        ]
+        if rows:
+            db.execute(RelatedPost.__table__.insert(), rows)
+        db.commit()
+        related_posts.lists_written += len(neighbours)
+    finally:
+        db.close()
+
+RELATED_COLUMNS = (Post.id, Post.title, Post.excerpt, Post.content, Post.tags)
+
+def rebuild_related_posts(batch_size: int = 500) -> int:
+    """Batch job: recompute every published post's related list; returns the number of posts"""
+    db = SessionLocal()
+    try:
+        stmt = select(*RELATED_COLUMNS).where(Post.is_published == True).execution_options(yield_per=batch_size)
+        neighbours, generation = related_posts.build(db.execute(stmt))
+    finally:
+        db.close()
+    # The full write runs without the lock; if a refresh landed meanwhile,
+    # rewrite from the current lists so its rows aren't left overwritten
+    store_related_posts(neighbours, replace_all=True)
+    related_posts.store_if_changed(generation)
+    return len(neighbours)
+
+def start_related_posts_build() -> threading.Thread:
+    """Run the batch job in the background; refreshes are queued until it finishes"""
+    def run():
+        try:
+            rebuild_related_posts()
+        except Exception as e:
+            logger.error(f"Related posts build failed: {e}")
+
+    thread = threading.Thread(target=run, name="related-posts-build", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,83 @@
+import os
+import hashlib
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from utils.cache import TTLCache
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    meta: Any = None
+
+class ResponseCache:
+    """
+    Cache of serialized public API responses.
+
+    Entries hold the JSON bytes and a strong ETag (hash of the bytes), keyed
+    by the endpoint and its normalized parameters. Admin post and category
+    writes call invalidate(), which drops everything; the TTL only bounds
+    staleness of data changed outside those handlers (e.g. view counts).
+
+    A response computed while an invalidation happens is not stored: callers
+    take `generation` before querying and pass it to store().
+    """
+
+    def __init__(self):
+        self.ttl = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+        self.maxsize = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+        self._entries = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        self._adapters: Dict[Any, TypeAdapter] = {}
+        self.generation = 0
+
+        # Metrics
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    def store(self, key: Hashable, value: Any, model_type: Any, generation: int, meta: Any = None) -> CachedResponse:
+        """Serialize `value` as `model_type` and cache it unless invalidated since `generation`"""
+        adapter = self._adapters.get(model_type)
+        if adapter is None:
+            adapter = self._adapters[model_type] = TypeAdapter(model_type)
+        body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+        entry = CachedResponse(body, f'"{hashlib.sha1(body).hexdigest()}"', meta)
+        if generation == self.generation:
+            self._entries.set(key, entry)
+        return entry
+
+    def invalidate(self):
+        """Drop all cached responses (called after admin content writes)"""
+        self.generation += 1
+        self._entries.clear()
+        self.invalidations += 1
+
+    def respond(self, request: Request, entry: CachedResponse) -> Response:
+        """200 with the cached body, or 304 if the client already has this ETag"""
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._entries.stats(),
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -0,0 +1,357 @@
+import re
+import math
+import html
+import time
+import logging
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from models.post import Post
+from utils.text import html_to_text, parse_tags
+
+logger = logging.getLogger(__name__)
+
+# Latin/Cyrillic-style words, or runs of Hangul, kana and CJK ideographs
+_CJK = "぀-ヿ㐀-䶿一-鿿가-힣"
+_TOKEN_PATTERN = re.compile(rf"[{_CJK}]+|[^\W{_CJK}]+", re.UNICODE)
+_CJK_PATTERN = re.compile(rf"[{_CJK}]")
+
+# Field weights: a term in the title counts as much as three in the body
+FIELD_WEIGHTS = (("title", 3.0), ("tags", 2.0), ("excerpt", 1.5), ("body", 1.0))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Query words at least this long also match longer indexed words (prefix)
+PREFIX_MIN_LENGTH = 3
+
+# Compact the postings once this share of slots belongs to removed posts
+COMPACT_RATIO = 0.25
+
+# Leading characters of each post's plain-text body kept for result snippets
+SNIPPET_SOURCE_LENGTH = 2000
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens. Runs of Korean/CJK characters are split into
+    overlapping bigrams (single characters are kept as-is), so words still
+    match when particles are attached and no dictionary is needed.
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(unicodedata.normalize("NFKC", text).lower()):
+        token = match.group(0)
+        if _CJK_PATTERN.match(token) and len(token) > 1:
+            tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            tokens.append(token)
+    return tokens
+
+def document_fields(post) -> Dict[str, str]:
+    """Indexed text of a post (ORM object or row with the same attributes)"""
+    return {
+        "title": post.title or "",
+        "tags": " ".join(parse_tags(post.tags)),
+        "excerpt": post.excerpt or "",
+        "body": html_to_text(post.content),
+    }
+
+class _Segment:
+    """
+    Index data: one slot per indexed document, with parallel arrays for
+    its post id, category, creation time and weighted length, and per term
+    a postings list of (slot, weighted term frequency) in two arrays.
+    Removed posts leave a dead slot until the next compaction. The start
+    of each live post's plain-text body is kept for result snippets.
+    """
+
+    def __init__(self):
+        self.post_ids = array("q")
+        self.categories = array("q")
+        self.created = array("d")
+        self.lengths = array("f")
+        self.alive = bytearray()
+        self.slot_of: Dict[int, int] = {}
+        self.snippet_sources: Dict[int, str] = {}
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.total_length = 0.0
+        self.live = 0
+        self.vocabulary: Optional[List[str]] = None
+
+    def add(self, post_id: int, category_id: Optional[int], created: float, fields: Dict[str, str]):
+        self.remove(post_id)
+        frequencies: Dict[str, float] = {}
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(fields.get(field, "")):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+                length += weight
+
+        slot = len(self.post_ids)
+        self.post_ids.append(post_id)
+        self.categories.append(category_id if category_id is not None else -1)
+        self.created.append(created)
+        self.lengths.append(length)
+        self.alive.append(1)
+        self.slot_of[post_id] = slot
+        self.snippet_sources[post_id] = fields.get("body", "")[:SNIPPET_SOURCE_LENGTH]
+        self.total_length += length
+        self.live += 1
+
+        for term, frequency in frequencies.items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array("i"), array("f"))
+                self.vocabulary = None
+            entry[0].append(slot)
+            entry[1].append(frequency)
+
+    def remove(self, post_id: int) -> bool:
+        slot = self.slot_of.pop(post_id, None)
+        if slot is None:
+            return False
+        self.snippet_sources.pop(post_id, None)
+        self.alive[slot] = 0
+        self.total_length -= self.lengths[slot]
+        self.live -= 1
+        return True
+
+    def dead_ratio(self) -> float:
+        return 1 - self.live / len(self.post_ids) if len(self.post_ids) else 0.0
+
+    def compacted(self) -> "_Segment":
+        """Copy of the live documents with dead slots dropped"""
+        segment = _Segment()
+        remap = array("i", [-1]) * len(self.post_ids)
+        for slot, alive in enumerate(self.alive):
+            if alive:
+                remap[slot] = len(segment.post_ids)
+                segment.post_ids.append(self.post_ids[slot])
+                segment.categories.append(self.categories[slot])
+                segment.created.append(self.created[slot])
+                segment.lengths.append(self.lengths[slot])
+                segment.alive.append(1)
+                segment.slot_of[self.post_ids[slot]] = remap[slot]
+        segment.total_length = sum(segment.lengths)
+        segment.live = len(segment.post_ids)
+        segment.snippet_sources = dict(self.snippet_sources)
+
+        for term, (slots, frequencies) in self.postings.items():
+            new_slots, new_frequencies = array("i"), array("f")
+            for slot, frequency in zip(slots, frequencies):
+                if remap[slot] >= 0:
+                    new_slots.append(remap[slot])
+                    new_frequencies.append(frequency)
+            if new_slots:
+                segment.postings[term] = (new_slots, new_frequencies)
+        return segment
+
+    def expand(self, token: str) -> List[str]:
+        """Indexed terms a query token matches: itself, plus longer words for prefixes"""
+        if len(token) < PREFIX_MIN_LENGTH or _CJK_PATTERN.match(token):
+            return [token] if token in self.postings else []
+        if self.vocabulary is None:
+            self.vocabulary = sorted(self.postings)
+        terms = []
+        i = bisect_left(self.vocabulary, token)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(token):
+            terms.append(self.vocabulary[i])
+            i += 1
+        return terms
+
+class SearchIndex:
+    """
+    In-process full-text index over published posts with BM25 ranking.
+
+    Built from the posts table in a background thread at startup, then
+    kept current by the admin post handlers (index_post / remove_post).
+    Searches never touch the database: they return ranked post ids,
+    optionally restricted to a category. All query words must match.
+    Snippets are cut from the indexed body text (snippet_source), so
+    results never need posts.content either.
+    """
+
+    def __init__(self):
+        self._segment = _Segment()
+        self._lock = threading.RLock()
+        self._building = False
+        self._pending: List[Tuple[str, Any]] = []
+        self.ready = False
+
+        # Metrics
+        self.build_seconds = 0.0
+        self.searches = 0
+
+    def build(self, rows: Iterable[Any]):
+        """
+        Replace the index with `rows` (published posts). Admin writes that
+        arrive while building are queued and replayed onto the new index.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._building = True
+            self._pending = []
+        try:
+            segment = _Segment()
+            for row in rows:
+                segment.add(row.id, row.category_id, _timestamp(row.created_at), document_fields(row))
+        except Exception:
+            with self._lock:
+                self._building = False
+            raise
+
+        with self._lock:
+            for action, payload in self._pending:
+                if action == "add":
+                    segment.add(*payload)
+                else:
+                    segment.remove(payload)
+            self._segment = segment
+            self._pending = []
+            self._building = False
+            self.ready = True
+        self.build_seconds = time.perf_counter() - started
+        logger.info(f"Search index built: {segment.live} posts, {len(segment.postings)} terms "
+                    f"in {self.build_seconds:.1f}s")
+
+    def index_post(self, post):
+        """Add or refresh a post; unpublished posts are removed from the index"""
+        if not post.is_published:
+            self.remove_post(post.id)
+            return
+        payload = (post.id, post.category_id, _timestamp(post.created_at), document_fields(post))
+        with self._lock:
+            if self._building:
+                self._pending.append(("add", payload))
+            if self.ready:
+                self._segment.add(*payload)
+
+    def remove_post(self, post_id: int):
+        with self._lock:
+            if self._building:
+                self._pending.append(("remove", post_id))
+            if self.ready:
+                self._segment.remove(post_id)
+                if self._segment.dead_ratio() > COMPACT_RATIO:
+                    self._segment = self._segment.compacted()
+
+    def search(self, query: str, category_id: Optional[int] = None) -> List[int]:
+        """Post ids matching every word of `query`, best BM25 score first (newest on ties)"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            segment = self._segment
+            self.searches += 1
+            if not segment.live:
+                return []
+
+            avg_length = segment.total_length / segment.live
+            alive, lengths, categories = segment.alive, segment.lengths, segment.categories
+            expansions = [segment.expand(token) for token in tokens]
+            # Rarest word first, so later words only score surviving candidates
+            expansions.sort(key=lambda terms: sum(len(segment.postings[t][0]) for t in terms))
+
+            scores: Optional[Dict[int, float]] = None
+            for terms in expansions:
+                token_scores: Dict[int, float] = {}
+                for term in terms:
+                    slots, frequencies = segment.postings[term]
+                    df = len(slots)
+                    idf = math.log(1 + (segment.live - df + 0.5) / (df + 0.5))
+                    for slot, tf in zip(slots, frequencies):
+                        if not alive[slot] or (scores is not None and slot not in scores):
+                            continue
+                        if category_id is not None and categories[slot] != category_id:
+                            continue
+                        norm = tf * (BM25_K1 + 1) / (
+                            tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths[slot] / avg_length)
+                        )
+                        token_scores[slot] = token_scores.get(slot, 0.0) + idf * norm
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {slot: scores[slot] + score for slot, score in token_scores.items()}
+                if not scores:
+                    return []
+
+            ranked = sorted(scores, key=lambda slot: (-scores[slot], -segment.created[slot]))
+            return [segment.post_ids[slot] for slot in ranked]
+
+    def snippet_source(self, post_id: int) -> Optional[str]:
+        """Start of the post's indexed plain-text body, or None if not indexed"""
+        return self._segment.snippet_sources.get(post_id)
+
+    def stats(self) -> Dict[str, Any]:
+        segment = self._segment
+        return {
+            "ready": self.ready,
+            "building": self._building,
+            "posts": segment.live,
+            "slots": len(segment.post_ids),
+            "terms": len(segment.postings),
+            "postings": sum(len(slots) for slots, _ in segment.postings.values()),
+            "build_seconds": round(self.build_seconds, 2),
+            "searches": self.searches,
+        }
+
+def _timestamp(value) -> float:
+    return value.timestamp() if value is not None else 0.0
+
+def make_snippet(text: str, query: str, width: int = 160) -> Optional[str]:
+    """
+    HTML-escaped excerpt of `text` around the first query word, with the
+    query words wrapped in <mark> (same format as the FTS snippets)
+    """
+    words = sorted({word for word in _TOKEN_PATTERN.findall(query.lower())}, key=len, reverse=True)
+    if not text or not words:
+        return None
+    pattern = re.compile("|".join(re.escape(word) for word in words), re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, match.start() - width // 3) if match else 0
+    excerpt = text[start:start + width]
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + width < len(text) else ""
+
+    # Match on the raw text and escape each piece, so a word like "amp"
+    # never matches inside an entity the escaping produced
+    parts = []
+    position = 0
+    for word in pattern.finditer(excerpt):
+        parts.append(html.escape(excerpt[position:word.start()]))
+        parts.append(f"<mark>{html.escape(word.group(0))}</mark>")
+        position = word.end()
+    parts.append(html.escape(excerpt[position:]))
+    return prefix + "".join(parts) + suffix
+
+# Global search index instance
+post_index = SearchIndex()
+
+INDEX_COLUMNS = (Post.id, Post.category_id, Post.created_at, Post.title, Post.excerpt, Post.content, Post.tags)
+
+def rebuild_post_index(batch_size: int = 500):
+    """Build the global index from published posts, streaming rows in batches"""
+    db = SessionLocal()
+    try:
+        stmt = select(*INDEX_COLUMNS).where(Post.is_published == True).execution_options(yield_per=batch_size)
+        post_index.build(db.execute(stmt))
+    finally:
+        db.close()
+
+def start_post_index_build() -> threading.Thread:
+    """Build the index in the background; searches use the fallback until it is ready"""
+    def run():
+        try:
+            rebuild_post_index()
+        except Exception as e:
+            logger.error(f"Search index build failed: {e}")
+
+    thread = threading.Thread(target=run, name="post-search-index", daemon=True)
+    thread.start()
+    return thread
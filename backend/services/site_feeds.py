@@ -0,0 +1,231 @@
+import os
+import gzip
+import html
+import hashlib
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from xml.etree import ElementTree as ET
+
+from fastapi import Request, Response
+from sqlalchemy import desc
+from sqlalchemy.orm import Session
+
+from models.post import Post
+from services.category_registry import category_registry
+
+SITE_URL = os.getenv("SITE_URL", "https://yhforensic.com").rstrip("/")
+SITE_TITLE = os.getenv("SITE_TITLE", "YH Digital Forensic Center")
+FEED_SIZE = int(os.getenv("FEED_SIZE", "20"))
+
+# Public pages of the frontend, and where each category's posts live
+STATIC_PAGES = (
+    "", "/about", "/digital-forensic", "/contact",
+    # Service pages under /digital-forensic (static Next routes, not categories)
+    "/digital-forensic/computer-forensics",
+    "/digital-forensic/mobile-forensics",
+    "/digital-forensic/cloud-forensics",
+    "/digital-forensic/data-recovery",
+    "/digital-forensic/expert-witness",
+)
+CATEGORY_PATHS = {
+    "press": "/press",
+    "training": "/training",
+    "general-forensics": "/digital-forensic/general-forensics",
+    "evidence-forensics": "/digital-forensic/evidence-forensics",
+    "digital-crime": "/digital-forensic/digital-crime",
+}
+DEFAULT_POST_PATH = "/blog"
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+# Columns used by the documents (never the HTML content)
+FEED_COLUMNS = (Post.id, Post.slug, Post.title, Post.excerpt, Post.category_id, Post.created_at, Post.updated_at)
+
+class RenderedDocument(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+    last_modified: datetime
+    media_type: str
+
+def _utc(value: Optional[datetime]) -> datetime:
+    """Database timestamps as aware UTC (SQLite returns naive UTC values)"""
+    if value is None:
+        return datetime(1970, 1, 1, tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def _modified(row) -> datetime:
+    return max(_utc(row.created_at), _utc(row.updated_at)) if row.updated_at else _utc(row.created_at)
+
+def section_path(category_slug: Optional[str]) -> str:
+    return CATEGORY_PATHS.get(category_slug, DEFAULT_POST_PATH)
+
+def post_url(db: Session, row) -> str:
+    category = category_registry.get(db, row.category_id) if row.category_id else None
+    return f"{SITE_URL}{section_path(category.slug if category else None)}/{row.slug}"
+
+def _serialize(root: ET.Element) -> bytes:
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+def render_sitemap(db: Session) -> RenderedDocument:
+    """sitemap.xml: static pages, category sections and every published post"""
+    rows = db.query(*FEED_COLUMNS).filter(Post.is_published == True).order_by(desc(Post.created_at)).all()
+    last_modified = max((_modified(row) for row in rows), default=_utc(None))
+
+    urlset = ET.Element("urlset", xmlns=SITEMAP_NS)
+
+    def add(loc: str, lastmod: Optional[datetime] = None):
+        url = ET.SubElement(urlset, "url")
+        ET.SubElement(url, "loc").text = loc
+        if lastmod is not None:
+            ET.SubElement(url, "lastmod").text = lastmod.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    for path in STATIC_PAGES:
+        add(f"{SITE_URL}{path}")
+    sections = {section_path(category.slug) for category in category_registry.all(db)} | {DEFAULT_POST_PATH}
+    for path in sorted(sections):
+        add(f"{SITE_URL}{path}")
+    for row in rows:
+        add(post_url(db, row), _modified(row))
+
+    return _document(_serialize(urlset), last_modified, "application/xml")
+
+def render_feed(db: Session) -> RenderedDocument:
+    """feed.xml: RSS 2.0 of the latest published posts"""
+    rows = db.query(*FEED_COLUMNS).filter(Post.is_published == True).order_by(
+        desc(Post.created_at), desc(Post.id)
+    ).limit(FEED_SIZE).all()
+    last_modified = max((_modified(row) for row in rows), default=_utc(None))
+
+    ET.register_namespace("atom", ATOM_NS)
+    rss = ET.Element("rss", version="2.0")
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = SITE_TITLE
+    ET.SubElement(channel, "link").text = SITE_URL
+    ET.SubElement(channel, "description").text = f"Latest posts from {SITE_TITLE}"
+    ET.SubElement(channel, f"{{{ATOM_NS}}}link", href=f"{SITE_URL}/feed.xml", rel="self", type="application/rss+xml")
+    ET.SubElement(channel, "lastBuildDate").text = format_datetime(last_modified)
+
+    for row in rows:
+        link = post_url(db, row)
+        item = ET.SubElement(channel, "item")
+        # Plain-text fields are stored HTML-escaped (utils/sanitization); XML escapes them itself
+        ET.SubElement(item, "title").text = html.unescape(row.title)
+        ET.SubElement(item, "link").text = link
+        ET.SubElement(item, "guid", isPermaLink="true").text = link
+        ET.SubElement(item, "pubDate").text = format_datetime(_utc(row.created_at))
+        if row.excerpt:
+            ET.SubElement(item, "description").text = html.unescape(row.excerpt)
+        category = category_registry.get(db, row.category_id) if row.category_id else None
+        if category:
+            ET.SubElement(item, "category").text = category.name
+
+    return _document(_serialize(rss), last_modified, "application/rss+xml")
+
+def _document(body: bytes, last_modified: datetime, media_type: str) -> RenderedDocument:
+    return RenderedDocument(
+        body=body,
+        gzipped=gzip.compress(body, compresslevel=9, mtime=0),
+        etag=f'"{hashlib.sha1(body).hexdigest()}"',
+        # HTTP dates have second resolution
+        last_modified=last_modified.replace(microsecond=0),
+        media_type=media_type,
+    )
+
+DOCUMENTS: Dict[str, Callable[[Session], RenderedDocument]] = {
+    "sitemap.xml": render_sitemap,
+    "feed.xml": render_feed,
+}
+
+class SiteFeeds:
+    """
+    Pre-rendered sitemap.xml and feed.xml, kept as plain and gzip bytes.
+
+    A document is rendered on the first request after startup or after an
+    admin post/category write called invalidate(); every other request is
+    served from memory (or answered 304) without touching the database.
+
+    Last-Modified is the newest post change, or the last invalidation if
+    later (deletes and category edits leave no newer post timestamp).
+    """
+
+    def __init__(self):
+        self._documents: Dict[str, RenderedDocument] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.changed_at: Optional[datetime] = None
+
+        # Metrics
+        self.renders = 0
+        self.hits = 0
+        self.not_modified = 0
+
+    def get(self, db: Session, name: str) -> RenderedDocument:
+        document = self._documents.get(name)
+        if document is not None:
+            self.hits += 1
+            return document
+        generation = self.generation
+        document = DOCUMENTS[name](db)
+        if self.changed_at is not None and self.changed_at > document.last_modified:
+            document = document._replace(last_modified=self.changed_at)
+        with self._lock:
+            if generation == self.generation:
+                self._documents[name] = document
+            self.renders += 1
+        return document
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._documents.clear()
+            self.changed_at = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def respond(self, request: Request, document: RenderedDocument) -> Response:
+        """The document (gzipped if accepted), or 304 for a matching ETag / If-Modified-Since"""
+        headers = {
+            "ETag": document.etag,
+            "Last-Modified": format_datetime(document.last_modified, usegmt=True),
+            "Cache-Control": "public, max-age=300",
+            "Vary": "Accept-Encoding",
+        }
+        if _not_modified(request, document):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=document.gzipped, media_type=document.media_type, headers=headers)
+        return Response(content=document.body, media_type=document.media_type, headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached": sorted(self._documents),
+            "renders": self.renders,
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+        }
+
+def _not_modified(request: Request, document: RenderedDocument) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags: List[str] = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or document.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return document.last_modified <= since
+    return False
+
+# Global sitemap/feed instance
+site_feeds = SiteFeeds()
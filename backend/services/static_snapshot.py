@@ -0,0 +1,315 @@
+import os
+import json
+import shutil
+import logging
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from pydantic import TypeAdapter
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+
+from database import SessionLocal
+from models.post import Post
+from schemas.post import Post as PostSchema
+from schemas.category import Category as CategorySchema
+from services.category_registry import category_registry
+from routers.posts import query_posts
+from utils.pagination import keyset_before
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "data/snapshot")
+# Rewrite the affected snapshot files on every admin post/category write
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "false").lower() == "true"
+SNAPSHOT_PAGE_SIZE = int(os.getenv("SNAPSHOT_PAGE_SIZE", "10"))
+SNAPSHOT_KEEP = int(os.getenv("SNAPSHOT_KEEP", "3"))
+
+FORMAT_VERSION = 1
+CURRENT_LINK = "current"
+MANIFEST_FILE = "manifest.json"
+
+_categories_adapter = TypeAdapter(List[CategorySchema])
+
+# Builds and incremental updates run in threadpool/background threads;
+# one at a time, so they never write the same version directory at once
+_lock = threading.RLock()
+
+# Layout of a snapshot version (paths mirror the API they stand in for):
+#   api/categories.json                          GET /api/categories
+#   api/posts/{slug}.json                        GET /api/posts/{slug}
+#   api/posts/page/{n}.json                      GET /api/posts?page={n}
+#   api/posts/category/{category}/page/{n}.json  GET /api/posts?category={category}&page={n}
+#   manifest.json                                version, page size, post slugs/categories
+
+def _path_segment(slug: str) -> str:
+    """A slug as a single file name (never a path out of the snapshot)"""
+    if not slug or slug.startswith(".") or "/" in slug or "\\" in slug:
+        raise ValueError(f"Slug not usable as a file name: {slug!r}")
+    return slug
+
+def post_file(slug: str) -> str:
+    return os.path.join("api", "posts", f"{_path_segment(slug)}.json")
+
+def listing_dir(category_slug: Optional[str]) -> str:
+    if category_slug is None:
+        return os.path.join("api", "posts", "page")
+    return os.path.join("api", "posts", "category", _path_segment(category_slug), "page")
+
+def current_version_dir() -> Optional[str]:
+    link = os.path.join(SNAPSHOT_DIR, CURRENT_LINK)
+    return os.path.realpath(link) if os.path.islink(link) else None
+
+def _write(root: str, relative: str, body: bytes):
+    """Write a file atomically (readers never see a partial file)"""
+    path = os.path.join(root, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+def _remove(root: str, relative: str) -> bool:
+    try:
+        os.remove(os.path.join(root, relative))
+        return True
+    except FileNotFoundError:
+        return False
+
+def _write_post(root: str, post: Post) -> str:
+    relative = post_file(post.slug)
+    _write(root, relative, PostSchema.model_validate(post).model_dump_json().encode())
+    return relative
+
+def _published_total(db: Session, category_id: Optional[int]) -> int:
+    """
+    Published posts overall or in one category, counted in the database:
+    page files are created and removed by this total, so it must be exact
+    (the post_counts cache can lag writes made outside the admin API)
+    """
+    query = db.query(func.count(Post.id)).filter(Post.is_published == True)
+    if category_id is not None:
+        query = query.filter(Post.category_id == category_id)
+    return query.scalar()
+
+def _write_listing(db: Session, root: str, category_id: Optional[int], pages: Optional[Set[int]] = None) -> List[str]:
+    """
+    Write the listing pages for all posts (category_id None) or one category:
+    every page, or only `pages`. Surplus pages from a longer listing are removed.
+    """
+    category_slug = None
+    if category_id is not None:
+        category = category_registry.get(db, category_id)
+        if category is None:
+            return []
+        category_slug = category.slug
+    directory = listing_dir(category_slug)
+
+    total = _published_total(db, category_id)
+    page_count = max(1, math.ceil(total / SNAPSHOT_PAGE_SIZE))
+    written = []
+    for page in sorted(pages) if pages is not None else range(1, page_count + 1):
+        if page > page_count:
+            continue
+        result = query_posts(db, page, SNAPSHOT_PAGE_SIZE, category_id, None, None).model_copy(update={
+            "total": total, "total_pages": math.ceil(total / SNAPSHOT_PAGE_SIZE)
+        })
+        relative = os.path.join(directory, f"{page}.json")
+        _write(root, relative, result.model_dump_json().encode())
+        written.append(relative)
+
+    if pages is None:
+        page = page_count + 1
+        while _remove(root, os.path.join(directory, f"{page}.json")):
+            written.append(os.path.join(directory, f"{page}.json"))
+            page += 1
+    return written
+
+def _load_manifest(root: str) -> Dict[str, Any]:
+    with open(os.path.join(root, MANIFEST_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_manifest(root: str, manifest: Dict[str, Any]):
+    manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+    _write(root, MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False, indent=1).encode())
+
+def build_snapshot(db: Session, batch_size: int = 100) -> Dict[str, Any]:
+    """
+    Render all published content into a new version directory, then
+    switch the `current` link to it and prune old versions.
+    """
+    with _lock:
+        return _build_snapshot(db, batch_size)
+
+def _build_snapshot(db: Session, batch_size: int) -> Dict[str, Any]:
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    root = os.path.join(SNAPSHOT_DIR, version)
+    os.makedirs(root)
+
+    category_registry.refresh(db)
+    categories = category_registry.all(db)
+    _write(root, os.path.join("api", "categories.json"), _categories_adapter.dump_json(categories))
+
+    posts: Dict[str, Dict[str, Any]] = {}
+    last_id = 0
+    while True:
+        batch = db.query(Post).options(joinedload(Post.category)).filter(
+            Post.is_published == True, Post.id > last_id
+        ).order_by(Post.id).limit(batch_size).all()
+        if not batch:
+            break
+        for post in batch:
+            try:
+                _write_post(root, post)
+            except ValueError as e:
+                logger.warning(f"Snapshot skipped post {post.id}: {e}")
+                continue
+            posts[str(post.id)] = {"slug": post.slug, "category_id": post.category_id}
+        last_id = batch[-1].id
+        db.expunge_all()
+
+    files = 1 + len(posts)
+    files += len(_write_listing(db, root, None))
+    for category in categories:
+        try:
+            files += len(_write_listing(db, root, category.id))
+        except ValueError as e:
+            logger.warning(f"Snapshot skipped category {category.id}: {e}")
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "page_size": SNAPSHOT_PAGE_SIZE,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "posts": posts,
+    }
+    _write_manifest(root, manifest)
+
+    # Atomic switch: readers follow either the old or the new version
+    link = os.path.join(SNAPSHOT_DIR, CURRENT_LINK)
+    tmp_link = f"{link}.tmp"
+    if os.path.lexists(tmp_link):
+        os.remove(tmp_link)
+    os.symlink(version, tmp_link)
+    os.replace(tmp_link, link)
+
+    versions = sorted(
+        name for name in os.listdir(SNAPSHOT_DIR)
+        if not os.path.islink(os.path.join(SNAPSHOT_DIR, name)) and os.path.isdir(os.path.join(SNAPSHOT_DIR, name))
+    )
+    for old in versions[:-SNAPSHOT_KEEP] if SNAPSHOT_KEEP > 0 else []:
+        if old != version:
+            shutil.rmtree(os.path.join(SNAPSHOT_DIR, old), ignore_errors=True)
+
+    logger.info(f"Snapshot {version}: {len(posts)} posts, {files} files")
+    return {"version": version, "posts": len(posts), "files": files}
+
+def _page_of(db: Session, post: Post, category_id: Optional[int]) -> int:
+    """Page holding `post` in the newest-first listing (optionally of one category)"""
+    older = db.query(Post.id).filter(
+        Post.is_published == True, keyset_before(Post.created_at, Post.id, (post.created_at, post.id))
+    )
+    if category_id is not None:
+        older = older.filter(Post.category_id == category_id)
+    newer = _published_total(db, category_id) - older.count() - 1
+    return max(0, newer) // SNAPSHOT_PAGE_SIZE + 1
+
+def update_snapshot_post(db: Session, post_id: int) -> List[str]:
+    """
+    Bring the current snapshot up to date after one post was created,
+    edited, unpublished or deleted; returns the files written or removed.
+
+    An edit that keeps the post in the same listings rewrites the post
+    file and the one page per listing that shows it. Publishing,
+    unpublishing, deleting or moving it to another category changes the
+    totals and shifts later pages, so those listings are rewritten whole
+    (other categories' listings are left alone).
+    """
+    with _lock:
+        return _update_snapshot_post(db, post_id)
+
+def _update_snapshot_post(db: Session, post_id: int) -> List[str]:
+    root = current_version_dir()
+    if root is None:
+        return []
+    manifest = _load_manifest(root)
+    if manifest["page_size"] != SNAPSHOT_PAGE_SIZE:
+        # Page boundaries differ from the current version: render a new one
+        build_snapshot(db)
+        return [MANIFEST_FILE]
+    key = str(post_id)
+    before = manifest["posts"].get(key)
+    post = db.query(Post).options(joinedload(Post.category)).filter(
+        Post.id == post_id, Post.is_published == True
+    ).first()
+
+    touched: List[str] = []
+    if before and (post is None or post.slug != before["slug"]):
+        if _remove(root, post_file(before["slug"])):
+            touched.append(post_file(before["slug"]))
+    if post is not None:
+        touched.append(_write_post(root, post))
+        manifest["posts"][key] = {"slug": post.slug, "category_id": post.category_id}
+    else:
+        manifest["posts"].pop(key, None)
+
+    if before is None and post is None:
+        return touched
+
+    same_listings = before is not None and post is not None and before["category_id"] == post.category_id
+    if same_listings:
+        touched += _write_listing(db, root, None, {_page_of(db, post, None)})
+        if post.category_id is not None:
+            touched += _write_listing(db, root, post.category_id, {_page_of(db, post, post.category_id)})
+    else:
+        touched += _write_listing(db, root, None)
+        categories = {before["category_id"] if before else None, post.category_id if post else None}
+        for category_id in categories - {None}:
+            touched += _write_listing(db, root, category_id)
+
+    _write_manifest(root, manifest)
+    return touched
+
+def snapshot_status() -> Dict[str, Any]:
+    root = current_version_dir()
+    if root is None:
+        return {"enabled": SNAPSHOT_ENABLED, "current": None}
+    manifest = _load_manifest(root)
+    return {
+        "enabled": SNAPSHOT_ENABLED,
+        "current": manifest["version"],
+        "posts": len(manifest["posts"]),
+        "page_size": manifest["page_size"],
+        "built_at": manifest["built_at"],
+        "updated_at": manifest["updated_at"],
+    }
+
+def refresh_snapshot_post(post_id: int):
+    """update_snapshot_post() in its own session, run as a background task of the admin write handlers"""
+    if not SNAPSHOT_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        update_snapshot_post(db, post_id)
+    except Exception as e:
+        # The snapshot lags until the next build; the write itself succeeded
+        logger.error(f"Snapshot update for post {post_id} failed: {e}")
+    finally:
+        db.close()
+
+def rebuild_snapshot():
+    """
+    Full build after a category write (names and slugs appear in every file),
+    run as a background task of the admin category handlers
+    """
+    if not SNAPSHOT_ENABLED or current_version_dir() is None:
+        return
+    db = SessionLocal()
+    try:
+        build_snapshot(db)
+    except Exception as e:
+        logger.error(f"Snapshot rebuild failed: {e}")
+    finally:
+        db.close()
@@ -0,0 +1,175 @@
+import os
+import re
+import gzip
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from models.visit import Visit, VisitDailyVisitor, kst_date
+from utils.time_ranges import KST, kst_midnight, kst_today
+
+logger = logging.getLogger(__name__)
+
+VISIT_ARCHIVE_DIR = os.getenv("VISIT_ARCHIVE_DIR", "data/visit_archive")
+VISIT_RETENTION_DAYS = int(os.getenv("VISIT_RETENTION_DAYS", "180"))
+
+ARCHIVE_COLUMNS = (
+    "id", "ip_address", "ip_masked", "page_path",
+    "country_code", "country_name", "user_agent", "created_at"
+)
+
+MONTH_PATTERN = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+def archive_path(month: str) -> str:
+    """Archive file for a KST month (YYYY-MM)"""
+    if not MONTH_PATTERN.match(month):
+        raise ValueError(f"Invalid archive month: {month}")
+    return os.path.join(VISIT_ARCHIVE_DIR, f"visits-{month}.ndjson.gz")
+
+def list_archived_months() -> List[str]:
+    if not os.path.isdir(VISIT_ARCHIVE_DIR):
+        return []
+    return sorted(
+        name[len("visits-"):-len(".ndjson.gz")]
+        for name in os.listdir(VISIT_ARCHIVE_DIR)
+        if name.startswith("visits-") and name.endswith(".ndjson.gz")
+    )
+
+def _serialize(row) -> Dict[str, Any]:
+    record = {column: getattr(row, column) for column in ARCHIVE_COLUMNS}
+    record["created_at"] = row.created_at.isoformat()
+    return record
+
+def archive_visits(
+    db: Session,
+    retention_days: int = VISIT_RETENTION_DAYS,
+    batch_size: int = 5000
+) -> Dict[str, Any]:
+    """
+    Move raw visits older than `retention_days` KST days into gzip NDJSON
+    files, one per KST month, then delete them from the visits table.
+
+    Work is done in id order in batches of `batch_size`: each batch is
+    appended to its month files (a new gzip member per batch) and flushed
+    to disk before the rows are deleted and the transaction committed, so
+    an interrupted run never loses rows. At worst a batch is archived
+    twice; read_archived_visits() drops duplicate ids.
+
+    Daily rollups and sketches are left untouched. The per-day visitor
+    sets (raw IPs) for archived days are pruned as well, since they are
+    only needed while a day is still receiving visits.
+    """
+    cutoff_day = kst_today() - timedelta(days=retention_days)
+    cutoff = kst_midnight(cutoff_day)
+    os.makedirs(VISIT_ARCHIVE_DIR, exist_ok=True)
+
+    archived = 0
+    months = Counter()
+    last_id = 0
+    while True:
+        batch = db.query(Visit).filter(
+            Visit.created_at < cutoff, Visit.id > last_id
+        ).order_by(Visit.id).limit(batch_size).all()
+        if not batch:
+            break
+
+        by_month: Dict[str, List[Dict[str, Any]]] = {}
+        for visit in batch:
+            month = kst_date(visit.created_at).strftime("%Y-%m")
+            by_month.setdefault(month, []).append(_serialize(visit))
+
+        for month, records in by_month.items():
+            with gzip.open(archive_path(month), "at", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            months[month] += len(records)
+
+        ids = [visit.id for visit in batch]
+        db.execute(delete(Visit).where(Visit.id.in_(ids)))
+        db.commit()
+        db.expunge_all()
+
+        last_id = ids[-1]
+        archived += len(ids)
+        logger.info(f"Archived {archived} visits (id <= {last_id})")
+
+    pruned = db.execute(
+        delete(VisitDailyVisitor).where(VisitDailyVisitor.day < cutoff_day)
+    ).rowcount
+    db.commit()
+
+    return {
+        "cutoff": cutoff.isoformat(),
+        "archived": archived,
+        "months": dict(sorted(months.items())),
+        "pruned_visitor_days": pruned,
+    }
+
+def _naive_kst(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(KST).replace(tzinfo=None)
+    return value
+
+def read_archived_visits(
+    month: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream archived visits of a KST month (YYYY-MM), optionally limited to
+    [start, end). created_at is returned as a naive KST datetime.
+    """
+    path = archive_path(month)
+    if not os.path.exists(path):
+        return
+
+    start = _naive_kst(start) if start is not None else None
+    end = _naive_kst(end) if end is not None else None
+
+    seen = set()
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["id"] in seen:
+                continue
+            seen.add(record["id"])
+
+            created_at = _naive_kst(datetime.fromisoformat(record["created_at"]))
+            if (start is not None and created_at < start) or (end is not None and created_at >= end):
+                continue
+            record["created_at"] = created_at
+            yield record
+
+def summarize_archived_month(month: str, top: int = 20) -> Optional[Dict[str, Any]]:
+    """Historical report for an archived month: totals, per-day, top pages and countries"""
+    if not os.path.exists(archive_path(month)):
+        return None
+
+    total = 0
+    visitors = set()
+    days = Counter()
+    pages = Counter()
+    countries = Counter()
+    for record in read_archived_visits(month):
+        total += 1
+        visitors.add(record["ip_address"])
+        days[record["created_at"].date().isoformat()] += 1
+        pages[record["page_path"]] += 1
+        if record.get("country_code"):
+            countries[record["country_code"]] += 1
+
+    return {
+        "month": month,
+        "visits": total,
+        "unique_visitors": len(visitors),
+        "daily_visits": dict(sorted(days.items())),
+        "top_pages": [{"page_path": path, "visits": count} for path, count in pages.most_common(top)],
+        "top_countries": [{"country_code": code, "visits": count} for code, count in countries.most_common(top)],
+    }
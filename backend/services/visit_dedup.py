@@ -0,0 +1,59 @@
+import os
+import threading
+from typing import Any, Dict
+
+from utils.cache import TTLCache
+
+class VisitDedup:
+    """
+    Suppresses repeat visits to the same page from the same IP.
+
+    The first (ip, page_path) hit opens a window of `window` seconds; further
+    hits inside it only bump that key's repeat counter and are not written.
+    The window is not extended by repeats, so a visitor who keeps refreshing
+    is still counted once per window. Keys live in a bounded TTL cache, so
+    memory stays flat under load (the oldest keys are evicted first).
+    A window of 0 disables suppression.
+    """
+
+    def __init__(self):
+        self.window = float(os.getenv("VISIT_DEDUP_WINDOW", "30"))
+        self.max_keys = int(os.getenv("VISIT_DEDUP_MAX_KEYS", "50000"))
+        self._seen = TTLCache(maxsize=self.max_keys, ttl=self.window)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.accepted = 0
+        self.suppressed = 0
+
+    def is_duplicate(self, ip_address: str, page_path: str) -> bool:
+        """Record a hit; True if it repeats a hit still inside its window"""
+        if self.window <= 0:
+            self.accepted += 1
+            return False
+
+        key = (ip_address, page_path)
+        with self._lock:
+            repeats = self._seen.get(key, count=False)
+            if repeats is not None:
+                repeats[0] += 1
+                self.suppressed += 1
+                return True
+            self._seen.set(key, [0])
+            self.accepted += 1
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.accepted + self.suppressed
+        return {
+            "window_seconds": self.window,
+            "accepted": self.accepted,
+            "suppressed": self.suppressed,
+            "suppression_rate": round(self.suppressed / total, 4) if total else 0.0,
+            "tracked_keys": len(self._seen),
+            "max_keys": self.max_keys,
+            "evictions": self._seen.evictions,
+        }
+
+# Global dedup window instance
+visit_dedup = VisitDedup()
@@ -0,0 +1,120 @@
+import io
+import csv
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from models.visit import Visit, VisitDailyCountry, VisitDailyPage
+from services.visit_archive import list_archived_months, read_archived_visits
+from utils.time_ranges import TimeRange, kst_days
+
+# Rows fetched per round trip while streaming
+EXPORT_BATCH_SIZE = 1000
+
+VISIT_COLUMNS = ["id", "created_at", "ip_masked", "page_path", "country_code", "country_name", "user_agent"]
+DAILY_COUNTRY_COLUMNS = ["day", "country_code", "country_name", "visits", "unique_visitors"]
+DAILY_PAGE_COLUMNS = ["day", "page_path", "visits"]
+
+EXPORT_DATASETS = {
+    "visits": VISIT_COLUMNS,
+    "daily_countries": DAILY_COUNTRY_COLUMNS,
+    "daily_pages": DAILY_PAGE_COLUMNS,
+}
+
+def _month_key(value: datetime) -> str:
+    return value.strftime("%Y-%m")
+
+def iter_visits(time_range: TimeRange) -> Iterator[Dict[str, Any]]:
+    """
+    Visits in the range, oldest first: archived months, then the live table.
+    Uses its own session so it can outlive the request handler.
+    Raw IP addresses are not exported, only the masked form.
+    """
+    first_month = _month_key(time_range.start)
+    last_month = _month_key(time_range.end)
+    for month in list_archived_months():
+        if first_month <= month <= last_month:
+            for record in read_archived_visits(month, time_range.start, time_range.end):
+                yield {column: record.get(column) for column in VISIT_COLUMNS}
+
+    db = SessionLocal()
+    try:
+        stmt = select(*(getattr(Visit, column) for column in VISIT_COLUMNS)).where(
+            time_range.filter(Visit.created_at)
+        ).order_by(Visit.created_at, Visit.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        for row in db.execute(stmt):
+            yield row._asdict()
+    finally:
+        db.close()
+
+def _iter_rollup(model, columns: Sequence[str], start: date, end: date) -> Iterator[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        stmt = select(*(getattr(model, column) for column in columns)).where(
+            model.day >= start, model.day <= end
+        ).order_by(*(getattr(model, column) for column in columns[:2])).execution_options(
+            yield_per=EXPORT_BATCH_SIZE
+        )
+        for row in db.execute(stmt):
+            yield row._asdict()
+    finally:
+        db.close()
+
+def iter_dataset(dataset: str, start: date, end: date) -> Iterator[Dict[str, Any]]:
+    """Rows of an export dataset for the KST days start..end inclusive"""
+    if dataset == "visits":
+        return iter_visits(kst_days(start, end))
+    if dataset == "daily_countries":
+        return _iter_rollup(VisitDailyCountry, DAILY_COUNTRY_COLUMNS, start, end)
+    if dataset == "daily_pages":
+        return _iter_rollup(VisitDailyPage, DAILY_PAGE_COLUMNS, start, end)
+    raise ValueError(f"Unknown export dataset: {dataset}")
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value)}")
+
+def encode_csv(rows: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[bytes]:
+    """Encode rows as CSV, one chunk per EXPORT_BATCH_SIZE rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow([
+            value.isoformat() if isinstance(value, (datetime, date)) else value
+            for value in (row.get(column) for column in columns)
+        ])
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+def encode_ndjson(rows: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, one chunk per EXPORT_BATCH_SIZE rows"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({column: row.get(column) for column in columns},
+                                default=_json_default, ensure_ascii=False))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a byte stream into a gzip stream on the fly"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
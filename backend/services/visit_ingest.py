@@ -0,0 +1,205 @@
+import os
+import queue
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, in-process only
+    fcntl = None
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models.visit import Visit
+
+logger = logging.getLogger(__name__)
+
+# Held by every flush and by rollup rebuilds, so backfill_visit_rollups.py
+# (a separate process) never writes rollups at the same time as the API
+ROLLUP_LOCK_FILE = os.getenv("VISIT_ROLLUP_LOCK_FILE", "data/visit_rollups.lock")
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+class VisitIngestQueue:
+    """
+    In-process write buffer for visit rows.
+
+    The tracking endpoint hands rows to submit() and returns immediately.
+    A background writer thread drains the buffer and inserts rows in one
+    executemany per transaction, flushing whenever `flush_size` rows are
+    waiting or `flush_interval` seconds have passed, whichever comes first.
+
+    A flush that fails is rolled back and its rows are retried on the next
+    flush, up to `max_retries` times, before they are counted as failed.
+    """
+
+    def __init__(self):
+        self.flush_size = int(os.getenv("VISIT_FLUSH_SIZE", "200"))
+        self.flush_interval = float(os.getenv("VISIT_FLUSH_INTERVAL", "2.0"))
+        self.max_queue = int(os.getenv("VISIT_QUEUE_MAX", "10000"))
+        self.max_retries = int(os.getenv("VISIT_FLUSH_RETRIES", "5"))
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=self.max_queue)
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._retry_rows: List[Dict[str, Any]] = []
+        self._retry_attempts = 0
+        self._flush_hooks: List[Callable[[Session, List[Dict[str, Any]]], None]] = []
+
+        # Metrics
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.retried = 0
+        self.flush_count = 0
+        self.last_flush_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    def add_flush_hook(self, hook: Callable[[Session, List[Dict[str, Any]]], None]):
+        """Register a callable run inside each flush transaction, after the insert"""
+        self._flush_hooks.append(hook)
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """Queue a visit row for writing. Returns False if the buffer is full."""
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        self.submitted += 1
+        if self._queue.qsize() >= self.flush_size:
+            self._wakeup.set()
+        return True
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="visit-ingest", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the writer thread and flush everything still buffered"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 10)
+            self._thread = None
+        while self._retry_rows or not self._queue.empty():
+            self.flush()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            while self.flush() >= self.flush_size:
+                # Keep draining while the buffer is still above the threshold
+                pass
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        rows = []
+        while len(rows) < self.flush_size:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """
+        Hold off flushes (of this process, and of the API process when run
+        from a script) while rollups are rewritten; visits keep buffering.
+        """
+        with self._flush_lock, _file_lock(ROLLUP_LOCK_FILE):
+            yield
+
+    def flush(self) -> int:
+        """
+        Write up to flush_size buffered rows in a single transaction.
+        Returns the number of rows written (0 when the flush failed).
+        """
+        with self.paused():
+            retry = bool(self._retry_rows)
+            rows = self._retry_rows if retry else self._drain()
+            if not rows:
+                return 0
+
+            started = time.perf_counter()
+            db = SessionLocal()
+            try:
+                db.execute(insert(Visit), rows)
+                for hook in self._flush_hooks:
+                    hook(db, rows)
+                db.commit()
+                self.written += len(rows)
+                self._retry_rows, self._retry_attempts = [], 0
+            except Exception as e:
+                db.rollback()
+                self._retry_attempts = self._retry_attempts + 1 if retry else 1
+                if self._retry_attempts <= self.max_retries:
+                    # Keep the rows: the next flush tries the same batch again
+                    self._retry_rows = rows
+                    self.retried += len(rows)
+                    logger.warning(f"Visit ingest flush failed ({len(rows)} rows), will retry: {e}")
+                else:
+                    self._retry_rows, self._retry_attempts = [], 0
+                    self.failed += len(rows)
+                    logger.error(f"Visit ingest flush failed ({len(rows)} rows), giving up: {e}")
+                rows = []
+            finally:
+                db.close()
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flush_count += 1
+            self.last_flush_size = len(rows)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self.total_flush_ms += elapsed_ms
+            return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and flush latency"""
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self.max_queue,
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "retried": self.retried,
+            "retry_pending": len(self._retry_rows),
+            "flush_count": self.flush_count,
+            "last_flush_size": self.last_flush_size,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "avg_flush_ms": round(self.total_flush_ms / self.flush_count, 3) if self.flush_count else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 3),
+        }
+
+# Global visit ingest queue instance
+visit_ingest = VisitIngestQueue()
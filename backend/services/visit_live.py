@@ -0,0 +1,124 @@
+import os
+import time
+import json
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+class VisitLiveFeed:
+    """
+    In-memory feed of recent visits for the live admin dashboard.
+
+    The tracking endpoint publishes each stored visit (masked IP only) into
+    a fixed-size ring buffer and refreshes the visitor's last-seen time.
+    Subscribers are woken through an asyncio.Event, so open dashboards read
+    from memory and never query the database.
+    """
+
+    def __init__(self):
+        self.buffer_size = int(os.getenv("LIVE_BUFFER_SIZE", "200"))
+        self.active_window = int(os.getenv("LIVE_ACTIVE_WINDOW", "300"))
+        self.max_active = int(os.getenv("LIVE_MAX_ACTIVE", "100000"))
+
+        self._buffer: deque = deque(maxlen=self.buffer_size)
+        self._last_seen: "OrderedDict[str, float]" = OrderedDict()
+        self._seq = 0
+        self._changed: Optional[asyncio.Event] = None
+
+        # Metrics
+        self.published = 0
+        self.subscribers = 0
+
+    def _event(self) -> asyncio.Event:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def _prune(self, now: float):
+        cutoff = now - self.active_window
+        while self._last_seen:
+            seen = next(iter(self._last_seen.values()))
+            if seen >= cutoff and len(self._last_seen) <= self.max_active:
+                break
+            self._last_seen.popitem(last=False)
+
+    def publish(self, ip_address: str, visit: Dict[str, Any]):
+        """Add a visit to the feed; must be called from the event loop"""
+        now = time.monotonic()
+        self._last_seen[ip_address] = now
+        self._last_seen.move_to_end(ip_address)
+        self._prune(now)
+
+        self._seq += 1
+        self._buffer.append({"seq": self._seq, **visit})
+        self.published += 1
+
+        # Wake every waiting subscriber, then arm a fresh event for the next visit
+        event = self._event()
+        self._changed = asyncio.Event()
+        event.set()
+
+    def active_visitors(self) -> int:
+        """Distinct IPs seen within the active window"""
+        self._prune(time.monotonic())
+        return len(self._last_seen)
+
+    def recent(self, after_seq: int = 0) -> List[Dict[str, Any]]:
+        return [entry for entry in self._buffer if entry["seq"] > after_seq]
+
+    @staticmethod
+    async def _wait(event: asyncio.Event, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stream(self, request, last_seq: int = 0, heartbeat: float = 15.0) -> AsyncIterator[str]:
+        """
+        Server-sent events: buffered visits newer than `last_seq`, then each
+        new visit as it arrives. An `active` event with the active visitor
+        count follows every batch and is repeated as a heartbeat.
+        """
+        self.subscribers += 1
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                # Taken before reading the buffer so a publish in between is not missed
+                changed = self._event()
+                for entry in self.recent(last_seq):
+                    last_seq = entry["seq"]
+                    yield _sse("visit", entry, event_id=entry["seq"])
+                yield _sse("active", {"active_visitors": self.active_visitors(), "window_seconds": self.active_window})
+
+                if await request.is_disconnected():
+                    break
+                await self._wait(changed, heartbeat)
+        finally:
+            self.subscribers -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "buffered": len(self._buffer),
+            "buffer_size": self.buffer_size,
+            "active_visitors": self.active_visitors(),
+            "active_window_seconds": self.active_window,
+        }
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value)}")
+
+def _sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=_json_default, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+# Global live feed instance
+visit_live = VisitLiveFeed()
@@ -0,0 +1,190 @@
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import func, delete
+from sqlalchemy.orm import Session
+
+from models.visit import (
+    Visit, VisitDailyCountry, VisitDailyPage, VisitDailyVisitor, VisitHourly, VisitSketch, kst_datetime
+)
+from services.visit_sketches import apply_visit_sketches
+from services.visit_ingest import visit_ingest
+from services.visit_archive import list_archived_months, read_archived_visits
+
+logger = logging.getLogger(__name__)
+
+def _dialect_insert(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert
+
+def upsert_increment(
+    db: Session,
+    model,
+    values: List[Dict[str, Any]],
+    index_elements: Sequence[str],
+    increments: Sequence[str],
+    updates: Sequence[str] = ()
+):
+    """
+    INSERT ... ON CONFLICT DO UPDATE that adds `increments` columns onto
+    existing rows (and overwrites `updates` columns when the new value is
+    not NULL), as one executemany.
+    """
+    if not values:
+        return
+
+    stmt = _dialect_insert(db)(model)
+    set_ = {col: getattr(model, col) + getattr(stmt.excluded, col) for col in increments}
+    set_.update({col: func.coalesce(getattr(stmt.excluded, col), getattr(model, col)) for col in updates})
+    db.execute(stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_), values)
+
+def apply_visit_rollups(db: Session, rows: Iterable[Dict[str, Any]]):
+    """
+    Fold a batch of visit rows into the daily rollup tables and the
+    unique-visitor sketches.
+    Runs inside the caller's transaction (the ingest flush or a backfill chunk).
+    """
+    rows = list(rows)
+    country_visits: Dict[tuple, int] = defaultdict(int)
+    country_names: Dict[tuple, str] = {}
+    page_visits: Dict[tuple, int] = defaultdict(int)
+    hourly_visits: Dict[tuple, int] = defaultdict(int)
+    visitors: Dict[tuple, str] = {}
+
+    for row in rows:
+        created_at = kst_datetime(row["created_at"])
+        day = created_at.date()
+        hourly_visits[(day, created_at.hour)] += 1
+        country_key = (day, row.get("country_code") or "")
+        country_visits[country_key] += 1
+        if row.get("country_name"):
+            country_names[country_key] = row["country_name"]
+        page_visits[(day, row["page_path"])] += 1
+        visitors.setdefault((day, row["ip_address"]), country_key[1])
+
+    if not country_visits:
+        return
+
+    # Which (day, ip) pairs are first seen in this batch: the rows actually
+    # inserted (a pair already stored, even by a concurrent writer, is skipped)
+    stmt = _dialect_insert(db)(VisitDailyVisitor).on_conflict_do_nothing(
+        index_elements=["day", "ip_address"]
+    ).returning(VisitDailyVisitor.day, VisitDailyVisitor.country_code)
+    unique_counts: Dict[tuple, int] = defaultdict(int)
+    for day, country in db.execute(stmt, [
+        {"day": day, "ip_address": ip, "country_code": country}
+        for (day, ip), country in visitors.items()
+    ]):
+        unique_counts[(day, country)] += 1
+
+    upsert_increment(
+        db, VisitDailyCountry,
+        [
+            {
+                "day": day,
+                "country_code": country,
+                "country_name": country_names.get((day, country)),
+                "visits": count,
+                "unique_visitors": unique_counts.get((day, country), 0),
+            }
+            for (day, country), count in country_visits.items()
+        ],
+        index_elements=["day", "country_code"],
+        increments=["visits", "unique_visitors"],
+        updates=["country_name"]
+    )
+    upsert_increment(
+        db, VisitDailyPage,
+        [
+            {"day": day, "page_path": page_path, "visits": count}
+            for (day, page_path), count in page_visits.items()
+        ],
+        index_elements=["day", "page_path"],
+        increments=["visits"]
+    )
+    upsert_increment(
+        db, VisitHourly,
+        [
+            {"day": day, "hour": hour, "visits": count}
+            for (day, hour), count in hourly_visits.items()
+        ],
+        index_elements=["day", "hour"],
+        increments=["visits"]
+    )
+    apply_visit_sketches(db, rows)
+
+def rebuild_visit_rollups(db: Session, batch_size: int = 2000) -> int:
+    """
+    Recompute all rollups from the visit archive files and the raw visits
+    table.
+
+    The rollups are cleared and the highest visit id is read in one
+    transaction; rows above that id are being folded in by the ingest
+    queue's flush hook, so only ids up to it are replayed here.
+
+    Each transaction runs with the ingest flush paused (see
+    VisitIngestQueue.paused), so a flush never interleaves with the
+    rebuild's rollup writes; flushes wait for at most one chunk.
+
+    Per-day visitor sets (raw IPs) are kept only for days still in the
+    visits table: those of an archived month are deleted once the month
+    has been replayed.
+    """
+    with visit_ingest.paused():
+        for model in (VisitDailyCountry, VisitDailyPage, VisitDailyVisitor, VisitHourly, VisitSketch):
+            db.execute(delete(model))
+        max_id = db.query(func.max(Visit.id)).scalar() or 0
+        db.commit()
+
+    def apply_chunk(chunk):
+        with visit_ingest.paused():
+            apply_visit_rollups(db, chunk)
+            db.commit()
+
+    processed = 0
+
+    # Archived months first (oldest data)
+    for month in list_archived_months():
+        chunk = []
+        days = set()
+        for record in read_archived_visits(month):
+            chunk.append(record)
+            days.add(record["created_at"].date())
+            if len(chunk) == batch_size:
+                apply_chunk(chunk)
+                processed += len(chunk)
+                chunk = []
+        if chunk:
+            apply_chunk(chunk)
+            processed += len(chunk)
+
+        # The visitor sets were only needed to count this month's uniques;
+        # drop them again, as archive_visits did when the days were archived
+        if days:
+            with visit_ingest.paused():
+                db.execute(delete(VisitDailyVisitor).where(VisitDailyVisitor.day.in_(days)))
+                db.commit()
+        logger.info(f"Rolled up archived month {month} ({processed} visits so far)")
+
+    last_id = 0
+    while last_id < max_id:
+        batch = db.query(
+            Visit.id, Visit.ip_address, Visit.page_path,
+            Visit.country_code, Visit.country_name, Visit.created_at
+        ).filter(
+            Visit.id > last_id, Visit.id <= max_id
+        ).order_by(Visit.id).limit(batch_size).all()
+        if not batch:
+            break
+
+        apply_chunk([row._asdict() for row in batch if row.created_at is not None])
+
+        last_id = batch[-1].id
+        processed += len(batch)
+        logger.info(f"Rolled up {processed} visits (id <= {last_id})")
+
+    return processed
@@ -0,0 +1,74 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Set, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from models.visit import VisitSketch, kst_date
+from utils.hyperloglog import HyperLogLog
+
+# 4096 registers per sketch, ~1.6% standard error
+SKETCH_PRECISION = 12
+
+def week_key(day: date) -> str:
+    """Sketch key of the Monday-Sunday week containing `day`"""
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+def apply_visit_sketches(db: Session, rows: Iterable[Dict[str, Any]]):
+    """
+    Add the visitor IPs of a batch of visit rows to the day, week (keyed by
+    its Monday), month, country and all-time sketches.
+    Runs inside the caller's transaction.
+    """
+    groups: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+    for row in rows:
+        ip = row["ip_address"]
+        day = kst_date(row["created_at"])
+        groups[("day", day.isoformat())].add(ip)
+        groups[("week", week_key(day))].add(ip)
+        groups[("month", day.strftime("%Y-%m"))].add(ip)
+        if row.get("country_code"):
+            groups[("country", row["country_code"])].add(ip)
+        groups[("total", "all")].add(ip)
+
+    if not groups:
+        return
+
+    # Read-modify-write of the registers: lock the rows where the database
+    # supports it (SQLite serializes writers, and ignores FOR UPDATE)
+    existing = {
+        (sketch.scope, sketch.key): sketch
+        for sketch in db.query(VisitSketch).filter(
+            tuple_(VisitSketch.scope, VisitSketch.key).in_(list(groups))
+        ).with_for_update()
+    }
+
+    for (scope, key), ips in groups.items():
+        db_sketch = existing.get((scope, key))
+        if db_sketch is None:
+            hll = HyperLogLog(SKETCH_PRECISION)
+            db_sketch = VisitSketch(scope=scope, key=key)
+            db.add(db_sketch)
+        else:
+            hll = HyperLogLog.from_bytes(db_sketch.sketch)
+        hll.update(ips)
+        db_sketch.sketch = hll.to_bytes()
+        db_sketch.estimate = hll.count()
+
+    db.flush()
+
+def sketch_estimates(db: Session, scope: str, keys: Iterable[str]) -> Dict[str, int]:
+    """Stored estimates for several keys of one scope"""
+    return dict(
+        db.query(VisitSketch.key, VisitSketch.estimate).filter(
+            VisitSketch.scope == scope, VisitSketch.key.in_(list(keys))
+        ).all()
+    )
+
+def sketch_estimate(db: Session, scope: str, key: str) -> int:
+    return sketch_estimates(db, scope, [key]).get(key, 0)
+
+def total_unique_visitors(db: Session) -> int:
+    """Estimated all-time unique visitors"""
+    return sketch_estimate(db, "total", "all")
@@ -0,0 +1,137 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# A throwaway database, set before anything imports `database`
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'test.db')}"
+os.environ["SNAPSHOT_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from database import Base, engine, SessionLocal
+from models.post import Post
+from models.category import Category
+from models.admin import Admin
+from auth import create_access_token, get_password_hash
+
+CATEGORIES = 5
+POSTS = 30
+TOPICS = ("mobile phone extraction", "malware network intrusion", "court expert testimony",
+          "cloud account recovery", "deleted file carving")
+ADMIN_USERNAME = "pytest-admin"
+
+class QueryCounter:
+    """
+    Records the SQL statements executed on an engine while active.
+
+        with QueryCounter(engine) as queries:
+            client.get("/api/posts")
+        print(queries.count, queries.statements)
+
+    Counts what reaches the DB-API cursor, so lazy loads issued during
+    response serialization are included.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+@pytest.fixture
+def count_queries():
+    """
+    Statement counter for the application engine:
+
+        with count_queries() as queries:
+            client.get("/api/posts")
+        assert queries.count == 2
+    """
+    return lambda: QueryCounter(engine)
+
+@pytest.fixture
+def max_queries():
+    """
+    Fails the test if the block executes more than `budget` statements:
+
+        with max_queries(2):
+            client.get("/api/posts")
+    """
+    @contextmanager
+    def budget(limit: int):
+        with QueryCounter(engine) as queries:
+            yield queries
+        statements = "\n".join(f"    {' '.join(statement.split())[:160]}" for statement in queries.statements)
+        assert queries.count <= limit, f"{queries.count} statements, budget {limit}:\n{statements}"
+    return budget
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    """Schema plus CATEGORIES categories and POSTS published posts spread round-robin across them"""
+    from services.post_search import ensure_post_search_index
+    from services.search_index import rebuild_post_index
+    from services.related_posts import rebuild_related_posts
+    from services.category_registry import category_registry
+    from services import post_tags  # noqa: F401 - registers the Post -> post_tags sync hooks
+
+    Base.metadata.create_all(bind=engine)
+    ensure_post_search_index(engine)
+    db = SessionLocal()
+    try:
+        for i in range(1, CATEGORIES + 1):
+            db.add(Category(id=i, name=f"Category {i}", slug=f"category-{i}"))
+        start = datetime(2024, 1, 1)
+        for i in range(POSTS):
+            db.add(Post(
+                title=f"Forensic report {i}",
+                slug=f"post-{i}",
+                content=f"<p>{TOPICS[i % len(TOPICS)]} case study {i}</p>",
+                excerpt=f"Evidence analysis {i}",
+                tags="forensics,mobile",
+                # Round-robin, so every listing page spans all categories
+                category_id=i % CATEGORIES + 1,
+                is_published=True,
+                created_at=start + timedelta(hours=i),
+            ))
+        db.add(Admin(username=ADMIN_USERNAME, hashed_password=get_password_hash(ADMIN_USERNAME)))
+        db.commit()
+        category_registry.refresh(db)
+    finally:
+        db.close()
+    rebuild_post_index()
+    rebuild_related_posts()
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(scope="session")
+def client(seeded_db):
+    # Startup events are not run: no background flush or index threads
+    # issuing statements while a test is counting
+    from main import app
+    return TestClient(app)
+
+@pytest.fixture(scope="session")
+def admin_headers(seeded_db):
+    return {"Authorization": f"Bearer {create_access_token({'sub': ADMIN_USERNAME})}"}
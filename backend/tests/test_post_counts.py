@@ -0,0 +1,34 @@
+from sqlalchemy import event
+
+from conftest import POSTS
+from database import SessionLocal
+from services.post_counts import PostCountCache
+
+def test_invalidate_during_load_is_not_lost(seeded_db, count_queries):
+    cache = PostCountCache()
+
+    def invalidate_mid_query(conn, cursor, statement, parameters, context, executemany):
+        # An admin write lands while the totals are being read
+        if "GROUP BY" in statement:
+            cache.invalidate()
+
+    db = SessionLocal()
+    event.listen(seeded_db, "before_cursor_execute", invalidate_mid_query)
+    try:
+        assert cache.total(db, published=True) == POSTS
+    finally:
+        event.remove(seeded_db, "before_cursor_execute", invalidate_mid_query)
+
+    try:
+        # The totals read during the invalidation were not kept: the next
+        # call queries again instead of serving them until the next write
+        with count_queries() as queries:
+            assert cache.total(db, published=True) == POSTS
+        assert queries.count == 1
+        assert cache.loads == 2
+
+        with count_queries() as queries:
+            cache.total(db, published=True)
+        assert queries.count == 0
+    finally:
+        db.close()
@@ -0,0 +1,126 @@
+"""
+Per-request SQL statement budgets for the post and category endpoints.
+
+Budgets are the statements each endpoint needs by design (listed beside
+it), plus one spare on reads so an incidental extra statement does not
+fail CI. The seed spreads every page across CATEGORIES categories, so a
+per-row regression such as a lazily loaded Post.category costs at least
+CATEGORIES extra statements and always exceeds the spare. Listings are
+also checked at two page sizes: their count must not grow with the page.
+
+Each request is made once to warm the in-memory registries and counts,
+then measured with the response and feed caches cleared, so the budget
+covers the uncached database path.
+"""
+
+import itertools
+
+import pytest
+
+from conftest import CATEGORIES, POSTS
+from models.post import Post
+from schemas.post import PostSummary
+from services import post_search
+from services.response_cache import response_cache
+from services.site_feeds import site_feeds
+
+_sequence = itertools.count()
+
+def new_post():
+    return {"title": "New post", "slug": f"new-post-{next(_sequence)}", "content": "<p>Body</p>",
+            "tags": "forensics,cloud", "is_published": True, "category_id": 1}
+
+def post_update():
+    return {"title": f"Updated title {1000 + next(_sequence)}", "tags": f"forensics,tag-{next(_sequence)}"}
+
+# (method, path, budget, admin, json body factory)
+ENDPOINTS = {
+    # page, categories (one SELECT IN)
+    "GET /api/posts": ("get", "/api/posts?limit=10", 3, False, None),
+    "GET /api/posts?category=": ("get", "/api/posts?category=category-2", 3, False, None),
+    # tag lookup, page, categories
+    "GET /api/posts?tag=": ("get", "/api/posts?tag=mobile", 4, False, None),
+    # tags table
+    "GET /api/tags": ("get", "/api/tags", 2, False, None),
+    # post joined with its category
+    "GET /api/posts/{slug}": ("get", "/api/posts/post-3", 3, False, None),
+    # related page, categories
+    "GET /api/posts/{slug}/related": ("get", "/api/posts/post-3/related", 3, False, None),
+    # served from the category registry: no spare, it must stay zero
+    "GET /api/categories": ("get", "/api/categories", 0, False, None),
+    # one column-only SELECT each (categories come from the registry)
+    "GET /sitemap.xml": ("get", "/sitemap.xml", 2, False, None),
+    "GET /feed.xml": ("get", "/feed.xml", 2, False, None),
+    # admin, page, categories
+    "GET /api/admin/posts": ("get", "/api/admin/posts?limit=10", 4, True, None),
+    # admin, post joined with its category
+    "GET /api/admin/posts/{id}": ("get", "/api/admin/posts/3", 3, True, None),
+    # admin, categories
+    "GET /api/admin/categories": ("get", "/api/admin/categories", 3, True, None),
+    # admin, slug check, insert, tags (lookup, insert, links, recount), search
+    # index, related lists, reload; independent of how many tags or posts exist
+    "POST /api/admin/posts": ("post", "/api/admin/posts", 15, True, new_post),
+    "PUT /api/admin/posts/{id}": ("put", "/api/admin/posts/3", 20, True, post_update),
+}
+
+@pytest.fixture
+def measure(client, admin_headers, max_queries):
+    def run(method, path, budget, admin=False, body=None):
+        kwargs = {"headers": admin_headers} if admin else {}
+        # Warm-up request: registries and cached totals are loaded once per process
+        for warm in (True, False):
+            response_cache.invalidate()
+            site_feeds.invalidate()
+            if body is not None:
+                kwargs["json"] = body()
+            if warm:
+                response = getattr(client, method)(path, **kwargs)
+                continue
+            with max_queries(budget) as queries:
+                response = getattr(client, method)(path, **kwargs)
+        assert response.status_code == 200, response.text
+        return queries
+    return run
+
+@pytest.mark.parametrize("endpoint", list(ENDPOINTS))
+def test_query_budget(endpoint, measure):
+    method, path, budget, admin, body = ENDPOINTS[endpoint]
+    measure(method, path, budget, admin, body)
+
+@pytest.mark.parametrize("backend,budget", [
+    ("fts", 3),    # count, ranked page with snippets, categories
+    ("index", 3),  # page, categories
+])
+def test_search_query_budget(backend, budget, measure, monkeypatch):
+    monkeypatch.setattr(post_search, "SEARCH_BACKEND", backend)
+    measure("get", "/api/posts?search=evidence", budget)
+
+@pytest.mark.parametrize("path", [
+    "/api/posts?limit={}",
+    "/api/posts?category=category-2&limit={}",
+    "/api/posts?tag=mobile&limit={}",
+])
+def test_listing_queries_do_not_grow_with_page_size(path, measure):
+    small = measure("get", path.format(2), 4)
+    large = measure("get", path.format(20), 4)
+    assert large.count == small.count
+
+def test_budget_catches_lazy_category_loads(seeded_db, count_queries):
+    # The regression the listing budgets guard against: one category SELECT per post
+    from database import SessionLocal
+    db = SessionLocal()
+    try:
+        with count_queries() as queries:
+            posts = db.query(Post).filter(Post.is_published == True).limit(10).all()
+            [PostSummary.model_validate(post) for post in posts]
+    finally:
+        db.close()
+    assert queries.count >= 1 + CATEGORIES > ENDPOINTS["GET /api/posts"][2]
+
+def test_delete_guard_query_budget(client, admin_headers, max_queries):
+    # admin, category, one COUNT of its posts; refused because the category has posts
+    client.delete("/api/admin/categories/2", headers=admin_headers)
+    with max_queries(3):
+        response = client.delete("/api/admin/categories/2", headers=admin_headers)
+    assert response.status_code == 400
+    assert f"{POSTS // CATEGORIES} posts" in response.json()["detail"]
@@ -0,0 +1,86 @@
+"""
+EXPLAIN QUERY PLAN checks for the date-filtered stats queries: the SQL the
+endpoints actually run is captured while calling them, and each statement
+filtering on created_at must search that column's index over a
+[start, end) range rather than scan the table, as the
+func.date(created_at) == ... form they replaced did.
+"""
+
+import re
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import event, func, select
+
+from models.inquiry import Inquiry
+from utils.time_ranges import kst_today
+
+# Endpoint -> (table, index) of each created_at-filtered statement it runs, in order
+ENDPOINTS = {
+    # routers/admin_dashboard.get_dashboard_stats: this/last month, then the last two 7-day windows
+    "/api/admin/dashboard/stats": [
+        ("posts", "ix_posts_created_at"),
+        ("posts", "ix_posts_created_at"),
+        ("inquiries", "ix_inquiries_created_at"),
+        ("inquiries", "ix_inquiries_created_at"),
+        ("posts", "ix_posts_created_at"),
+        ("posts", "ix_posts_created_at"),
+    ],
+    # routers/admin_inquiries.get_inquiry_stats: inquiries today
+    "/api/admin/inquiries/stats": [
+        ("inquiries", "ix_inquiries_created_at"),
+    ],
+    # services/visit_export.iter_visits: the raw visits in the export range
+    "/api/admin/analytics/export?dataset=visits": [
+        ("visits", "ix_visits_created_at"),
+    ],
+}
+
+CREATED_AT_FILTER = re.compile(r"\bWHERE\b.*\bcreated_at\b", re.DOTALL)
+
+def capture_date_filtered(engine, call) -> List[Tuple[str, tuple]]:
+    """Statements (with parameters) filtering on created_at that `call` runs on `engine`"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if CREATED_AT_FILTER.search(statement):
+            statements.append((statement, tuple(parameters)))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+def explain(engine, statement: str, parameters: tuple = ()) -> str:
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+def assert_index_search(plan: str, table: str, index_name: str):
+    pattern = rf"SEARCH {table} USING (COVERING )?INDEX {index_name} \(created_at>\? AND created_at<\?\)"
+    assert re.search(pattern, plan), plan
+    assert "SCAN" not in plan, plan
+
+@pytest.mark.parametrize("url", list(ENDPOINTS))
+def test_date_filters_search_index(url, client, admin_headers, seeded_db):
+    def call():
+        response = client.get(url, headers=admin_headers)
+        assert response.status_code == 200, response.text
+
+    statements = capture_date_filtered(seeded_db, call)
+    expected = ENDPOINTS[url]
+    assert len(statements) == len(expected), [" ".join(sql.split())[:160] for sql, _ in statements]
+    for (sql, parameters), (table, index_name) in zip(statements, expected):
+        assert_index_search(explain(seeded_db, sql, parameters), table, index_name)
+
+def test_func_date_form_fails_the_check(seeded_db):
+    # The form the stats used before: the index cannot be searched through date()
+    compiled = select(func.count()).select_from(Inquiry).where(
+        func.date(Inquiry.created_at) == kst_today()
+    ).compile(seeded_db)
+    parameters = tuple(str(compiled.params[name]) for name in compiled.positiontup)
+    plan = explain(seeded_db, str(compiled), parameters)
+    with pytest.raises(AssertionError):
+        assert_index_search(plan, "inquiries", "ix_inquiries_created_at")
@@ -0,0 +1,78 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from services import related_posts as related_module
+from services.related_posts import RelatedPosts
+
+TOPICS = ("mobile phone extraction", "malware network intrusion", "cloud account recovery")
+
+def post(post_id, topic, is_published=True):
+    return SimpleNamespace(
+        id=post_id, title=f"{topic} report", excerpt=topic, content=f"<p>{topic} case {post_id}</p>",
+        tags="forensics", is_published=is_published
+    )
+
+@pytest.fixture
+def rows():
+    return [post(i, TOPICS[i % len(TOPICS)]) for i in range(1, 31)]
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Calls to store_related_posts, instead of writing the table"""
+    calls = []
+    monkeypatch.setattr(related_module, "store_related_posts",
+                        lambda neighbours, replace_all=False: calls.append((dict(neighbours), replace_all)))
+    return calls
+
+def test_build_scores_without_holding_the_lock(rows, monkeypatch):
+    model = RelatedPosts()
+    acquired = []
+    scores = RelatedPosts._scores
+
+    def probe(self, post_id, vector):
+        if not acquired:
+            # Another thread (an admin write) must get the lock mid-build
+            def try_lock():
+                if model._lock.acquire(timeout=1):
+                    acquired.append(True)
+                    model._lock.release()
+                else:
+                    acquired.append(False)
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+        return scores(self, post_id, vector)
+
+    monkeypatch.setattr(RelatedPosts, "_scores", probe)
+    neighbours, _ = model.build(rows)
+    assert acquired == [True]
+    assert neighbours[1] and all(related_id % 3 == 1 for related_id, _ in neighbours[1])
+
+def test_refresh_during_build_is_replayed(rows, stored):
+    model = RelatedPosts()
+    model.ready = True
+
+    def rows_with_refresh():
+        yield from rows
+        model.refresh_post(post(31, TOPICS[0]))
+
+    neighbours, _ = model.build(rows_with_refresh())
+    assert 31 in neighbours
+    assert neighbours[31] and all(related_id % 3 == 0 for related_id, _ in neighbours[31])
+
+def test_full_write_is_redone_after_a_concurrent_refresh(rows, stored):
+    model = RelatedPosts()
+    neighbours, generation = model.build(rows)
+    assert not model.store_if_changed(generation)
+    assert stored == []
+
+    # A refresh lands between build() and the full table write
+    model.refresh_post(post(1, TOPICS[0]))
+    assert stored and stored[-1][1] is False
+    assert model.store_if_changed(generation)
+    lists, replace_all = stored[-1]
+    assert replace_all
+    assert lists[1] != neighbours[1]
+    assert all(related_id % 3 == 0 for related_id, _ in lists[1])
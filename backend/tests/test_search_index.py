@@ -0,0 +1,9 @@
+from services.search_index import make_snippet
+
+def test_snippet_does_not_mark_inside_escaped_entities():
+    snippet = make_snippet('Smith & Wesson <case> "files"', "amp lt gt quot")
+    assert snippet == "Smith &amp; Wesson &lt;case&gt; &quot;files&quot;"
+
+def test_snippet_marks_words_and_escapes_around_them():
+    snippet = make_snippet("Tom & Jerry: AMP <b>amplifier</b> report", "amp")
+    assert snippet == "Tom &amp; Jerry: <mark>AMP</mark> &lt;b&gt;<mark>amp</mark>lifier&lt;/b&gt; report"
@@ -0,0 +1,31 @@
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from database import SessionLocal
+from services.site_feeds import SITE_URL, SITEMAP_NS, render_sitemap
+
+SERVICE_PAGES = (
+    "/digital-forensic/computer-forensics",
+    "/digital-forensic/mobile-forensics",
+    "/digital-forensic/cloud-forensics",
+    "/digital-forensic/data-recovery",
+    "/digital-forensic/expert-witness",
+)
+
+@pytest.fixture
+def sitemap_urls(seeded_db):
+    db = SessionLocal()
+    try:
+        root = ET.fromstring(render_sitemap(db).body)
+    finally:
+        db.close()
+    return [loc.text for loc in root.iter(f"{{{SITEMAP_NS}}}loc")]
+
+@pytest.mark.parametrize("path", SERVICE_PAGES)
+def test_sitemap_lists_service_pages(sitemap_urls, path):
+    assert f"{SITE_URL}{path}" in sitemap_urls
+
+def test_sitemap_lists_published_posts(sitemap_urls):
+    assert any(url.endswith("/post-0") for url in sitemap_urls)
+    assert len(sitemap_urls) == len(set(sitemap_urls))
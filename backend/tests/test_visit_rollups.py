@@ -0,0 +1,67 @@
+"""
+Rollup rebuild over archived and raw visits: per-day counts must match the
+original rollups, and the per-day visitor sets pruned by archive_visits
+must not come back.
+"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import delete, func
+
+from database import SessionLocal
+from models.visit import Visit, VisitDailyCountry, VisitDailyVisitor
+from services import visit_archive, visit_ingest
+from services.visit_archive import archive_visits
+from services.visit_rollups import apply_visit_rollups, rebuild_visit_rollups
+from utils.time_ranges import kst_midnight, kst_today
+
+RETENTION_DAYS = 30
+
+@pytest.fixture
+def db(seeded_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(visit_archive, "VISIT_ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(visit_ingest, "ROLLUP_LOCK_FILE", str(tmp_path / "visit_rollups.lock"))
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    for model in (Visit, VisitDailyCountry, VisitDailyVisitor):
+        session.execute(delete(model))
+    session.commit()
+    session.close()
+
+def add_visits(db, day, ips):
+    rows = [
+        {"ip_address": ip, "page_path": "/", "country_code": "KR", "country_name": "South Korea",
+         "created_at": kst_midnight(day) + timedelta(hours=10, minutes=i)}
+        for i, ip in enumerate(ips)
+    ]
+    for row in rows:
+        db.add(Visit(**row))
+    apply_visit_rollups(db, rows)
+    db.commit()
+
+def daily_counts(db):
+    return {
+        row.day: (row.visits, row.unique_visitors)
+        for row in db.query(VisitDailyCountry).filter(VisitDailyCountry.country_code == "KR")
+    }
+
+def test_rebuild_keeps_archived_visitor_sets_pruned(db):
+    old_day = kst_today() - timedelta(days=RETENTION_DAYS + 5)
+    recent_day = kst_today() - timedelta(days=1)
+    add_visits(db, old_day, ["10.0.0.1", "10.0.0.2", "10.0.0.1"])
+    add_visits(db, recent_day, ["10.0.0.3", "10.0.0.3"])
+    expected = daily_counts(db)
+
+    result = archive_visits(db, retention_days=RETENTION_DAYS)
+    assert result["archived"] == 3
+    assert result["pruned_visitor_days"] == 2
+
+    # Small batches, so an archived day spans several chunks
+    rebuild_visit_rollups(db, batch_size=1)
+
+    assert daily_counts(db) == expected
+    assert expected[old_day] == (3, 2)
+    assert {row.day for row in db.query(VisitDailyVisitor)} == {recent_day}
+    assert db.query(func.count(VisitDailyVisitor.ip_address)).scalar() == 1
@@ -0,0 +1,194 @@
+import os
+import sys
+import csv
+import socket
+import struct
+import logging
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# File layout: magic, then counts, then raw little-endian arrays.
+#   header:   MAGIC | v4_count (u32) | v6_count (u32) | country_count (u32)
+#   v4:       starts u32[n] | ends u32[n] | country u16[n]
+#   v6:       starts u64[n] | ends u64[n] | country u16[n]
+#   countries: "CC\tName\n" lines, utf-8
+MAGIC = b"YHGEO1\0\0"
+HEADER = struct.Struct("<8sIII")
+
+def _ip_to_int(value: str) -> Tuple[int, int]:
+    """Convert an IP string (or integer string) to (version, integer)"""
+    value = value.strip()
+    if value.isdigit():
+        number = int(value)
+        return (4 if number <= 0xFFFFFFFF else 6), number
+    if ":" in value:
+        return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, value), "big")
+    return 4, int.from_bytes(socket.inet_aton(value), "big")
+
+class IPRangeTable:
+    """
+    Offline IP → country lookup table.
+
+    Ranges are kept in sorted parallel arrays and searched with binary
+    search. IPv6 ranges are indexed by their upper 64 bits: country
+    allocations are never finer than a /64, so the lower half carries no
+    geographic information and every bound fits in an unsigned 64-bit slot.
+    """
+
+    def __init__(self):
+        self.v4_starts = array("I")
+        self.v4_ends = array("I")
+        self.v4_country = array("H")
+        self.v6_starts = array("Q")
+        self.v6_ends = array("Q")
+        self.v6_country = array("H")
+        self.countries: List[Tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.v4_starts) + len(self.v6_starts)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, str, Optional[str]]]) -> "IPRangeTable":
+        """
+        Build a table from (start, end, country_code, country_name) rows.
+        Start/end may be IP strings or integers; rows with an unknown
+        country code ("-", "ZZ", empty) are skipped.
+        """
+        country_index: Dict[str, int] = {}
+        countries: List[Tuple[str, str]] = []
+        v4: List[Tuple[int, int, int]] = []
+        v6: List[Tuple[int, int, int]] = []
+
+        for start, end, code, name in rows:
+            code = (code or "").strip().upper()
+            if not code or code in ("-", "ZZ"):
+                continue
+            if code not in country_index:
+                country_index[code] = len(countries)
+                countries.append((code, (name or "").strip() or code))
+
+            start_version, start_int = _ip_to_int(start)
+            end_version, end_int = _ip_to_int(end)
+            if start_version == 4 and end_version == 4:
+                v4.append((start_int, end_int, country_index[code]))
+            else:
+                # IPv4 blocks inside IP2Location-style IPv6 files are mapped ::ffff:a.b.c.d
+                if start_int >> 32 == 0xFFFF and end_int >> 32 == 0xFFFF:
+                    v4.append((start_int & 0xFFFFFFFF, end_int & 0xFFFFFFFF, country_index[code]))
+                else:
+                    v6.append((start_int >> 64, end_int >> 64, country_index[code]))
+
+        table = cls()
+        table.countries = countries
+        for (starts, ends, idx), ranges in (
+            ((table.v4_starts, table.v4_ends, table.v4_country), v4),
+            ((table.v6_starts, table.v6_ends, table.v6_country), v6),
+        ):
+            ranges.sort()
+            for start_int, end_int, country in ranges:
+                starts.append(start_int)
+                ends.append(end_int)
+                idx.append(country)
+        return table
+
+    @classmethod
+    def from_csv(cls, *paths: str) -> "IPRangeTable":
+        """
+        Build a table from one or more CSV files (e.g. separate IPv4 and IPv6
+        files) with rows of start,end,country_code[,country_name]
+        (IP2Location LITE / DB-IP style). Header rows are ignored.
+        """
+        def rows():
+            for path in paths:
+                with open(path, newline="", encoding="utf-8") as f:
+                    for record in csv.reader(f):
+                        if len(record) < 3 or record[0].strip().lower() in ("ip_from", "start", "ip_start"):
+                            continue
+                        yield record[0], record[1], record[2], record[3] if len(record) > 3 else None
+        return cls.from_rows(rows())
+
+    def save(self, path: str):
+        """Write the table to the compact binary format"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self.v4_starts), len(self.v6_starts), len(self.countries)))
+            for arr in (self.v4_starts, self.v4_ends, self.v4_country,
+                        self.v6_starts, self.v6_ends, self.v6_country):
+                out = array(arr.typecode, arr)
+                if out.itemsize > 1 and sys.byteorder == "big":
+                    out.byteswap()
+                f.write(out.tobytes())
+            f.write("".join(f"{code}\t{name}\n" for code, name in self.countries).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: str) -> "IPRangeTable":
+        """Load a table written by save()"""
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, v4_count, v6_count, country_count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a GeoIP range table")
+
+        table = cls()
+        offset = HEADER.size
+        for arr, count in ((table.v4_starts, v4_count), (table.v4_ends, v4_count),
+                           (table.v4_country, v4_count), (table.v6_starts, v6_count),
+                           (table.v6_ends, v6_count), (table.v6_country, v6_count)):
+            size = arr.itemsize * count
+            arr.frombytes(data[offset:offset + size])
+            if sys.byteorder == "big":
+                arr.byteswap()
+            offset += size
+
+        lines = data[offset:].decode("utf-8").splitlines()
+        table.countries = [tuple(line.split("\t", 1)) for line in lines[:country_count]]
+        return table
+
+    def lookup(self, ip: str) -> Optional[Tuple[str, str]]:
+        """Return (country_code, country_name) for an IP, or None if not covered"""
+        try:
+            if ":" in ip:
+                number = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
+                if number >> 32 == 0xFFFF:
+                    return self._search(self.v4_starts, self.v4_ends, self.v4_country, number & 0xFFFFFFFF)
+                return self._search(self.v6_starts, self.v6_ends, self.v6_country, number >> 64)
+            number = int.from_bytes(socket.inet_aton(ip), "big")
+            return self._search(self.v4_starts, self.v4_ends, self.v4_country, number)
+        except (OSError, ValueError):
+            return None
+
+    def _search(self, starts: array, ends: array, countries: array, number: int) -> Optional[Tuple[str, str]]:
+        i = bisect_right(starts, number) - 1
+        if i >= 0 and number <= ends[i]:
+            return self.countries[countries[i]]
+        return None
+
+GEOIP_DB_PATH = os.getenv("GEOIP_DB_PATH", "data/geoip.bin")
+
+_table: Optional[IPRangeTable] = None
+_table_loaded = False
+_table_lock = threading.Lock()
+
+def get_geoip_table() -> Optional[IPRangeTable]:
+    """Load the offline GeoIP table once; returns None if no table is installed"""
+    global _table, _table_loaded
+    if _table_loaded:
+        return _table
+
+    with _table_lock:
+        if not _table_loaded:
+            if os.path.exists(GEOIP_DB_PATH):
+                try:
+                    _table = IPRangeTable.load(GEOIP_DB_PATH)
+                    logger.info(f"Loaded GeoIP table with {len(_table)} ranges from {GEOIP_DB_PATH}")
+                except Exception as e:
+                    logger.error(f"Failed to load GeoIP table {GEOIP_DB_PATH}: {e}")
+            _table_loaded = True
+    return _table
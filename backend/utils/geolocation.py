@@ -1,32 +1,174 @@
+import os
+import asyncio
+import ipaddress
 import httpx
 from typing import Dict, Optional
 
-async def get_country_from_ip(ip: str) -> Dict[str, Optional[str]]:
+from utils.cache import TTLCache
+from utils.geoip import get_geoip_table
+
+# Remote ip-api.com lookups are only used when the offline table has no answer
+GEOIP_HTTP_FALLBACK = os.getenv("GEOIP_HTTP_FALLBACK", "true").lower() == "true"
+
+# Lookup cache: results are shared by every address in the same /24 (IPv4)
+# or /48 (IPv6) unless GEOIP_CACHE_BY_PREFIX is disabled
+GEOIP_CACHE_SIZE = int(os.getenv("GEOIP_CACHE_SIZE", "50000"))
+GEOIP_CACHE_TTL = float(os.getenv("GEOIP_CACHE_TTL", "86400"))
+GEOIP_NEGATIVE_TTL = float(os.getenv("GEOIP_NEGATIVE_TTL", "600"))
+GEOIP_CACHE_BY_PREFIX = os.getenv("GEOIP_CACHE_BY_PREFIX", "true").lower() == "true"
+
+EMPTY_RESULT = {"country_code": None, "country_name": None}
+
+geo_cache = TTLCache(maxsize=GEOIP_CACHE_SIZE, ttl=GEOIP_CACHE_TTL)
+
+# Shared connection-pooled client, opened on app startup
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Remote lookups currently in flight, keyed like the cache
+_inflight: Dict[str, "asyncio.Future"] = {}
+
+lookup_counters = {
+    "offline_hits": 0,
+    "remote_lookups": 0,
+    "remote_failures": 0,
+    "coalesced": 0,
+}
+
+async def open_http_client():
+    """Create the shared ip-api.com client (called on app startup)"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=5.0,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+        )
+
+async def close_http_client():
+    """Close the shared ip-api.com client (called on app shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+def is_private_ip(ip: str) -> bool:
     """
-    Get country information from IP address using ip-api.com
-    Returns dict with country_code and country_name
+    Check whether an IP is local/private (or not a valid IP at all)
     """
+    if ip == 'localhost':
+        return True
     try:
-        # Skip local/private IPs
-        if ip in ['127.0.0.1', 'localhost'] or ip.startswith('192.168.') or ip.startswith('10.'):
-            return {"country_code": None, "country_name": None}
-        
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return True
+    return address.is_private or address.is_loopback or address.is_link_local or address.is_reserved
+
+def cache_key(ip: str) -> str:
+    """
+    Cache key for an IP: its /24 or /48 network, or the address itself
+    """
+    if not GEOIP_CACHE_BY_PREFIX:
+        return ip
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return ip
+    prefix = 24 if address.version == 4 else 48
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+async def lookup_country_remote(ip: str) -> Dict[str, Optional[str]]:
+    """
+    Get country information from ip-api.com
+    """
+    lookup_counters["remote_lookups"] += 1
+    try:
+        if _http_client is not None:
+            response = await _http_client.get(
                 f"http://ip-api.com/json/{ip}?fields=status,country,countryCode"
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("status") == "success":
-                    return {
-                        "country_code": data.get("countryCode"),
-                        "country_name": data.get("country")
-                    }
+        else:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(
+                    f"http://ip-api.com/json/{ip}?fields=status,country,countryCode"
+                )
+
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("status") == "success":
+                return {
+                    "country_code": data.get("countryCode"),
+                    "country_name": data.get("country")
+                }
     except Exception as e:
         print(f"Geolocation error for IP {ip}: {e}")
-    
-    return {"country_code": None, "country_name": None}
+
+    lookup_counters["remote_failures"] += 1
+    return dict(EMPTY_RESULT)
+
+async def _resolve(ip: str) -> Dict[str, Optional[str]]:
+    table = get_geoip_table()
+    if table is not None:
+        match = table.lookup(ip)
+        if match:
+            lookup_counters["offline_hits"] += 1
+            return {"country_code": match[0], "country_name": match[1]}
+
+    if GEOIP_HTTP_FALLBACK:
+        return await lookup_country_remote(ip)
+
+    return dict(EMPTY_RESULT)
+
+async def get_country_from_ip(ip: str) -> Dict[str, Optional[str]]:
+    """
+    Get country information from IP address.
+    Answers come from the lookup cache, then the offline GeoIP range table,
+    then ip-api.com if GEOIP_HTTP_FALLBACK is enabled. Unknown and private
+    addresses are cached too (with a shorter TTL for lookup failures), and
+    concurrent lookups for the same key share a single remote request.
+    Returns dict with country_code and country_name
+    """
+    key = cache_key(ip)
+    cached = geo_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Skip local/private IPs
+    if is_private_ip(ip):
+        geo_cache.set(key, EMPTY_RESULT)
+        return EMPTY_RESULT
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        lookup_counters["coalesced"] += 1
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # The request that owned the lookup was cancelled
+            return EMPTY_RESULT
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await _resolve(ip)
+    except BaseException:
+        future.cancel()
+        raise
+    finally:
+        del _inflight[key]
+
+    ttl = GEOIP_CACHE_TTL if result.get("country_code") else GEOIP_NEGATIVE_TTL
+    geo_cache.set(key, result, ttl=ttl)
+    future.set_result(result)
+    return result
+
+def geolocation_stats() -> Dict[str, int]:
+    """Cache hit/miss and lookup counters"""
+    return {
+        **geo_cache.stats(),
+        **lookup_counters,
+        "inflight": len(_inflight),
+    }
 
 def mask_ip_address(ip: str) -> str:
     """
@@ -38,4 +180,4 @@ def mask_ip_address(ip: str) -> str:
             return f"{parts[0]}.{parts[1]}.xxx.xxx"
         return "xxx.xxx.xxx.xxx"
     except:
-        return "xxx.xxx.xxx.xxx"
\ No newline at end of file
+        return "xxx.xxx.xxx.xxx"
@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque cursor for the row at (created_at, id)"""
+    payload = json.dumps({"t": created_at.isoformat(), "id": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor from encode_cursor(); returns None if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+def keyset_before(created_at_column, id_column, cursor: Tuple[datetime, int]):
+    """
+    Rows strictly after the cursor in (created_at DESC, id DESC) order.
+    Written as ranges so the created_at index can be used for the seek.
+
+    "Same timestamp" is the range (created_at - 1µs, created_at] rather than
+    an equality test: SQLite stores server-default timestamps without
+    microseconds ('... 10:00:00') but binds them with ('... 10:00:00.000000'),
+    and only the range matches both spellings.
+    """
+    created_at, id = cursor
+    just_before = created_at - timedelta(microseconds=1)
+    return or_(
+        created_at_column <= just_before,
+        and_(created_at_column > just_before, created_at_column <= created_at, id_column < id)
+    )
+
+def clamp_limit(limit: int, maximum: int) -> int:
+    return max(1, min(limit, maximum))
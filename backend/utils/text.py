@@ -0,0 +1,31 @@
+import re
+import html
+import json
+from typing import List, Optional
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_SPACE_PATTERN = re.compile(r"\s+")
+_SLUG_PATTERN = re.compile(r"[^\w]+", re.UNICODE)
+
+def html_to_text(content: Optional[str]) -> str:
+    """Plain text of (already sanitized) post HTML, for indexing and previews"""
+    if not content:
+        return ""
+    text = html.unescape(_TAG_PATTERN.sub(" ", content))
+    return _SPACE_PATTERN.sub(" ", text).strip()
+
+def parse_tags(tags: Optional[str]) -> List[str]:
+    """Tags stored in Post.tags, either a JSON list or a comma-separated string"""
+    if not tags:
+        return []
+    try:
+        parsed = json.loads(tags)
+        if isinstance(parsed, list):
+            return [str(tag).strip() for tag in parsed if str(tag).strip()]
+    except ValueError:
+        pass
+    return [tag.strip() for tag in tags.split(",") if tag.strip()]
+
+def tag_slug(tag: str) -> str:
+    """URL key of a tag: lowercase words joined by '-' (Korean kept as-is)"""
+    return _SLUG_PATTERN.sub("-", tag.lower()).strip("-_")[:100]
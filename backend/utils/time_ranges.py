@@ -0,0 +1,74 @@
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple, Optional
+
+import pytz
+from sqlalchemy import and_
+
+# Korea Standard Time
+KST = pytz.timezone('Asia/Seoul')
+
+class TimeRange(NamedTuple):
+    """
+    Half-open [start, end) timestamp range with KST-aware bounds.
+
+    Filter with `column >= start AND column < end` (see filter()) rather
+    than wrapping the column in func.date(), so the index on the
+    timestamp column can be used for a range search.
+    """
+    start: datetime
+    end: datetime
+
+    def filter(self, column):
+        """SQL condition selecting rows whose `column` falls in the range"""
+        return and_(column >= self.start, column < self.end)
+
+    def utc(self) -> "TimeRange":
+        """
+        Same range as naive UTC bounds, for columns filled by the database
+        clock (server_default=func.now()), which SQLite stores as UTC.
+        """
+        return TimeRange(
+            self.start.astimezone(pytz.utc).replace(tzinfo=None),
+            self.end.astimezone(pytz.utc).replace(tzinfo=None)
+        )
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days
+
+def kst_now() -> datetime:
+    return datetime.now(KST)
+
+def kst_today() -> date:
+    return kst_now().date()
+
+def kst_midnight(day: date) -> datetime:
+    """Start of a KST calendar day as an aware datetime"""
+    return KST.localize(datetime.combine(day, time.min))
+
+def kst_days(start: date, end: date) -> TimeRange:
+    """KST calendar days start..end inclusive"""
+    return TimeRange(kst_midnight(start), kst_midnight(end + timedelta(days=1)))
+
+def kst_day(day: Optional[date] = None) -> TimeRange:
+    """A single KST day (today by default)"""
+    day = day or kst_today()
+    return kst_days(day, day)
+
+def kst_week(day: Optional[date] = None) -> TimeRange:
+    """The Monday-Sunday KST week containing `day` (this week by default)"""
+    day = day or kst_today()
+    monday = day - timedelta(days=day.weekday())
+    return kst_days(monday, monday + timedelta(days=6))
+
+def kst_month(day: Optional[date] = None) -> TimeRange:
+    """The KST calendar month containing `day` (this month by default)"""
+    day = day or kst_today()
+    first = day.replace(day=1)
+    next_first = (first + timedelta(days=32)).replace(day=1)
+    return TimeRange(kst_midnight(first), kst_midnight(next_first))
+
+def last_days(days: int, now: Optional[datetime] = None) -> TimeRange:
+    """Rolling window of the last `days` days ending now"""
+    now = now or kst_now()
+    return TimeRange(now - timedelta(days=days), now)
@@ -18,6 +18,7 @@ import Link from 'next/link'
 import { Card, Badge, Button } from '@/components/ui'
 import AdminLayout from '@/components/admin/AdminLayout'
 import { authUtils } from '@/utils/auth'
+import { useLiveVisits } from '@/hooks/useLiveVisits'
 
 interface AnalyticsStats {
   total_visitors: number
@@ -33,16 +34,6 @@ interface CountryStats {
   percentage: number
 }
 
-interface RecentVisit {
-  id: number
-  ip_masked: string
-  page_path: string
-  country_name: string
-  country_code: string
-  created_at: string
-  user_agent: string
-}
-
 const getCountryFlag = (countryCode: string | null): string => {
   if (!countryCode) return '🌍'
   
@@ -80,7 +71,8 @@ const AnalyticsPage: React.FC = () => {
     visitors_this_month: 0
   })
   const [countries, setCountries] = useState<CountryStats[]>([])
-  const [recentVisits, setRecentVisits] = useState<RecentVisit[]>([])
+  // Recent visitors arrive over the live stream (served from memory, no DB queries)
+  const { visits: recentVisits, activeVisitors, connected } = useLiveVisits()
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
 
@@ -93,22 +85,19 @@ const AnalyticsPage: React.FC = () => {
       setLoading(true)
       setError(null)
       
-      const [statsResponse, countriesResponse, recentResponse] = await Promise.all([
+      const [statsResponse, countriesResponse] = await Promise.all([
         authUtils.fetchWithAuth(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/analytics/stats`),
-        authUtils.fetchWithAuth(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/analytics/countries`),
-        authUtils.fetchWithAuth(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/analytics/recent`)
+        authUtils.fetchWithAuth(`${process.env.NEXT_PUBLIC_API_URL}/api/admin/analytics/countries`)
       ])
 
-      if (!statsResponse.ok || !countriesResponse.ok || !recentResponse.ok) {
+      if (!statsResponse.ok || !countriesResponse.ok) {
         throw new Error('Failed to fetch analytics data')
       }
 
       const statsData = await statsResponse.json()
       const countriesData = await countriesResponse.json()
-      const recentData = await recentResponse.json()
 
       console.log('Countries data:', countriesData);
-      console.log('Recent visits data:', recentData);
 
       setStats(statsData)
       
@@ -120,7 +109,6 @@ const AnalyticsPage: React.FC = () => {
       }))
       
       setCountries(countriesWithPercentage)
-      setRecentVisits(recentData || [])
       
     } catch (error) {
       console.error('Failed to fetch analytics data:', error)
@@ -190,7 +178,7 @@ const AnalyticsPage: React.FC = () => {
           <div className="flex items-center space-x-3 mt-4 md:mt-0">
             <Badge variant="accent">
               <Activity className="w-3 h-3 mr-1" />
-              Live Data
+              {connected ? `${activeVisitors.toLocaleString()} active now` : 'Connecting...'}
             </Badge>
           </div>
         </div>
@@ -319,8 +307,8 @@ const AnalyticsPage: React.FC = () => {
                       <span>Page</span>
                       <span>Time</span>
                     </div>
-                    {recentVisits.slice(0, 20).map((visit, index) => (
-                      <div key={visit.id} className="grid grid-cols-4 gap-4 py-2 hover:bg-slate-700/50 rounded-lg transition-colors">
+                    {recentVisits.map((visit) => (
+                      <div key={visit.seq} className="grid grid-cols-4 gap-4 py-2 hover:bg-slate-700/50 rounded-lg transition-colors">
                         <span className="text-slate-300 text-sm font-mono">
                           {visit.ip_masked}
                         </span>
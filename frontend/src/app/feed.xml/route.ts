@@ -0,0 +1,9 @@
+import { NextRequest } from 'next/server'
+import { proxyBackendDocument } from '@/lib/backendDocument'
+
+// RSS feed of the latest published posts, generated by the backend (GET /feed.xml)
+export const dynamic = 'force-dynamic'
+
+export async function GET(request: NextRequest) {
+  return proxyBackendDocument(request, '/feed.xml')
+}
@@ -0,0 +1,106 @@
+'use client';
+
+import { useEffect, useState } from 'react';
+import { authUtils } from '@/utils/auth';
+
+export interface LiveVisit {
+  seq: number
+  ip_masked: string
+  page_path: string
+  country_code: string | null
+  country_name: string | null
+  user_agent: string
+  created_at: string
+}
+
+const MAX_VISITS = 20;
+const DEFAULT_RETRY_MS = 5000;
+
+// Subscribes to the admin live visit stream (server-sent events, served from
+// memory). Read with fetch rather than EventSource, which cannot send the
+// Authorization header; reconnects resume from the last event id.
+export function useLiveVisits() {
+  const [visits, setVisits] = useState<LiveVisit[]>([]);
+  const [activeVisitors, setActiveVisitors] = useState(0);
+  const [connected, setConnected] = useState(false);
+
+  useEffect(() => {
+    const controller = new AbortController();
+    let lastEventId = '';
+    let retryMs = DEFAULT_RETRY_MS;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+
+    const handleEvent = (event: string, data: string) => {
+      if (event === 'visit') {
+        const visit: LiveVisit = JSON.parse(data);
+        setVisits(prev => [visit, ...prev.filter(v => v.seq !== visit.seq)].slice(0, MAX_VISITS));
+      } else if (event === 'active') {
+        setActiveVisitors(JSON.parse(data).active_visitors);
+      }
+    };
+
+    const connect = async () => {
+      try {
+        const response = await authUtils.fetchWithAuth(
+          `${process.env.NEXT_PUBLIC_API_URL}/api/admin/analytics/live`,
+          {
+            headers: {
+              Accept: 'text/event-stream',
+              ...(lastEventId ? { 'Last-Event-ID': lastEventId } : {})
+            },
+            signal: controller.signal
+          }
+        );
+        if (response.status === 401) return; // fetchWithAuth sends the browser to the login page
+        if (!response.ok || !response.body) {
+          throw new Error(`Live stream returned ${response.status}`);
+        }
+        setConnected(true);
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+
+          // Events end with a blank line
+          let boundary = buffer.indexOf('\n\n');
+          while (boundary >= 0) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            boundary = buffer.indexOf('\n\n');
+
+            let event = 'message';
+            const data: string[] = [];
+            for (const line of block.split('\n')) {
+              if (line.startsWith('event:')) event = line.slice(6).trim();
+              else if (line.startsWith('data:')) data.push(line.slice(5).trimStart());
+              else if (line.startsWith('id:')) lastEventId = line.slice(3).trim();
+              else if (line.startsWith('retry:')) retryMs = parseInt(line.slice(6), 10) || retryMs;
+            }
+            if (data.length > 0) handleEvent(event, data.join('\n'));
+          }
+        }
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        console.error('Live visit stream error:', error);
+      }
+
+      setConnected(false);
+      if (!controller.signal.aborted) {
+        retryTimer = setTimeout(connect, retryMs);
+      }
+    };
+
+    connect();
+
+    return () => {
+      controller.abort();
+      if (retryTimer) clearTimeout(retryTimer);
+    };
+  }, []);
+
+  return { visits, activeVisitors, connected };
+}
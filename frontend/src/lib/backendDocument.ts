@@ -0,0 +1,42 @@
+import { NextRequest, NextResponse } from 'next/server'
+
+// Base URL of the API as seen from the Next.js server. Inside Docker the
+// public NEXT_PUBLIC_API_URL is not reachable, so BACKEND_URL points at the
+// backend service (e.g. http://backend:8000).
+const BACKEND_URL = process.env.BACKEND_URL || process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
+
+// Conditional request headers go to the backend and validators come back,
+// so crawlers still get 304s. Compression is left to Next.js: fetch
+// decompresses the backend's gzip body.
+const FORWARDED_REQUEST_HEADERS = ['if-none-match', 'if-modified-since']
+const FORWARDED_RESPONSE_HEADERS = ['content-type', 'etag', 'last-modified', 'cache-control']
+
+export async function proxyBackendDocument(request: NextRequest, path: string): Promise<NextResponse> {
+  const headers: Record<string, string> = {}
+  for (const name of FORWARDED_REQUEST_HEADERS) {
+    const value = request.headers.get(name)
+    if (value) headers[name] = value
+  }
+
+  let response: Response
+  try {
+    response = await fetch(`${BACKEND_URL}${path}`, { headers, cache: 'no-store' })
+  } catch (error) {
+    console.error(`Failed to fetch ${path} from the backend:`, error)
+    return new NextResponse(null, { status: 502 })
+  }
+
+  const responseHeaders: Record<string, string> = {}
+  for (const name of FORWARDED_RESPONSE_HEADERS) {
+    const value = response.headers.get(name)
+    if (value) responseHeaders[name] = value
+  }
+
+  if (response.status === 304) {
+    return new NextResponse(null, { status: 304, headers: responseHeaders })
+  }
+  if (!response.ok) {
+    return new NextResponse(null, { status: 502 })
+  }
+  return new NextResponse(await response.arrayBuffer(), { status: 200, headers: responseHeaders })
+}